@@ -22,6 +22,7 @@ from pydantic import BaseModel
 from ..config import (
     AUDIT_ENABLED,
     BEDROCK_MODEL_ID,
+    CACHE_ENABLED,
     MEMORY_ENABLED,
 )
 from ..ui.audit_interface import create_audit_interface
@@ -47,6 +48,27 @@ async def lifespan(app: FastAPI):
         print("[AUDIT] CloudWatch inicializado.")
     yield
     print("App cerrando")
+    from ..tools.benefits_api import close_http_client
+    from ..tools.cloudwatch_unhandled_queries import get_cw_service
+    from ..tools.push_notifications import close_push_client
+    from ..tools.query_pipeline import drain_unknown_reports
+    await close_http_client()
+    # Los reportes en vuelo usan el cliente push y la cola de CloudWatch:
+    # esperarlos antes de cerrar ambos (si no, se pierde el evento o se
+    # recrea un cliente push que nadie cierra)
+    await drain_unknown_reports()
+    await close_push_client()
+    if CACHE_ENABLED:
+        from ..cache.cache_service import get_cache_service
+        # Escribe los set() write-behind que todavía no salieron a Redis
+        await (await get_cache_service()).drain()
+    # Drena las unhandled queries encoladas antes de que muera el proceso
+    await (await get_cw_service()).close()
+    if AUDIT_ENABLED:
+        from ..audit.audit_service import get_audit_service
+        # Drena los records encolados antes de que muera el proceso
+        svc = await get_audit_service()
+        await svc.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -72,8 +94,11 @@ async def read_root():
 
 
 @app.get("/audit/session/{session_id}")
-async def get_audit_session(session_id: str):
-    """Devuelve el resumen y registros de auditoría de una sesión."""
+async def get_audit_session(session_id: str, include_payloads: bool = True):
+    """
+    Devuelve el resumen y registros de auditoría de una sesión.
+    Con include_payloads=false los records vienen sin input/output/error.
+    """
     if not AUDIT_ENABLED:
         raise HTTPException(
             status_code=503,
@@ -83,28 +108,19 @@ async def get_audit_session(session_id: str):
     from ..audit.audit_service import get_audit_service
     svc = await get_audit_service()
 
-    summary = await svc.get_session(session_id)
+    summary, records = await svc.session_view(session_id, include_payloads)
     if summary is None:
         raise HTTPException(
             status_code=404,
             detail=f"Sesión '{session_id}' no encontrada",
         )
 
-    records = await svc.get_session_records(session_id)
-
-    def _record_to_dict(r):
-        d = r.model_dump()
-        d["event_type"] = r.event_type.value
-        if r.token_usage:
-            d["token_usage"] = r.token_usage.model_dump()
-        return d
-
     return JSONResponse(content={
         "session": {
             **summary.model_dump(),
             "total_tokens": summary.total_tokens,
         },
-        "records": [_record_to_dict(r) for r in records],
+        "records": [r.model_dump() for r in records],
     })
 
 
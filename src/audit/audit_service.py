@@ -13,6 +13,7 @@ Principios de diseño:
 
 from __future__ import annotations
 
+import asyncio
 import traceback
 from datetime import datetime, timezone
 from typing import Any, Optional
@@ -308,14 +309,42 @@ class AuditService:
     async def get_session_records(self, session_id: str) -> list[AuditRecord]:
         return await self._storage.get_session_records(session_id)
 
+    async def get_session_records_summary(
+        self, session_id: str
+    ) -> list[AuditRecord]:
+        return await self._storage.get_session_records_summary(session_id)
+
+    async def session_view(
+        self,
+        session_id: str,
+        include_payloads: bool = True,
+    ) -> tuple[Optional[SessionSummary], list[AuditRecord]]:
+        """
+        Resumen + records de una sesión para las vistas de detalle.
+        Las dos queries de Insights corren en paralelo (cada una hace
+        su propio polling), en vez de esperar una detrás de la otra.
+        """
+        records_coro = (
+            self._storage.get_session_records(session_id)
+            if include_payloads
+            else self._storage.get_session_records_summary(session_id)
+        )
+        summary, records = await asyncio.gather(
+            self.get_session(session_id), records_coro
+        )
+        return summary, records
+
+    async def get_session_messages(self, session_id: str) -> list[dict]:
+        return await self._storage.get_session_messages(session_id)
+
     async def list_sessions(
         self,
         limit: int = 50,
-        offset: int = 0,
+        before: Optional[str] = None,
         has_error: Optional[bool] = None,
     ) -> list[SessionSummary]:
         return await self._storage.list_sessions(
-            limit=limit, offset=offset, has_error=has_error
+            limit=limit, before=before, has_error=has_error
         )
 
     async def close(self) -> None:
@@ -327,6 +356,7 @@ class AuditService:
 # --------------------------------------------------------------------------
 
 _service: Optional[AuditService] = None
+_service_lock = asyncio.Lock()
 
 
 def _build_storage() -> BaseAuditStorage:
@@ -350,11 +380,19 @@ async def get_audit_service() -> AuditService:
     """
     Retorna el singleton de AuditService.
     Inicializa el backend CloudWatch la primera vez que se llama.
-    Thread-safe en un único event loop (asyncio standard).
+
+    El singleton se publica recién después de initialize(): dos requests
+    concurrentes en el arranque no construyen dos storages ni reciben
+    un servicio a medio inicializar. Una vez creado, el camino rápido
+    es una sola lectura del global, sin tomar el lock.
     """
     global _service
-    if _service is None:
-        storage = _build_storage()
-        _service = AuditService(storage=storage)
-        await _service.initialize()
+    service = _service
+    if service is not None:
+        return service
+    async with _service_lock:
+        if _service is None:
+            service = AuditService(storage=_build_storage())
+            await service.initialize()
+            _service = service
     return _service
@@ -10,15 +10,18 @@ from __future__ import annotations
 import hashlib
 import json
 from datetime import datetime, timezone
-from enum import Enum
+from enum import StrEnum
 from typing import Any, Optional
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
 
-class EventType(str, Enum):
-    """Tipos de eventos que se registran en el sistema de auditoría."""
+class EventType(StrEnum):
+    """
+    Tipos de eventos que se registran en el sistema de auditoría.
+    StrEnum: cada miembro ya es su valor str (no hace falta .value).
+    """
     USER_INPUT = "user_input"
     SUPERVISOR_DECISION = "supervisor_decision"
     LLM_CALL = "llm_call"
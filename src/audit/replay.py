@@ -35,12 +35,10 @@ class SessionReplayer:
         Genera un reporte textual completo de la sesión.
         Ideal para pegar en un issue de debugging o para revisión manual.
         """
-        summary = await self._svc.get_session(session_id)
+        summary, records = await self._svc.session_view(session_id)
         if summary is None:
             return f"[ERROR] Session '{session_id}' no encontrada en la DB."
 
-        records = await self._svc.get_session_records(session_id)
-
         lines: list[str] = []
         lines.append("=" * 70)
         lines.append(f"  REPLAY -- Session {session_id}")
@@ -75,17 +73,20 @@ class SessionReplayer:
 
         Retorna: [{"role": "human", "content": "..."}, {"role": "assistant", ...}]
         """
-        records = await self._svc.get_session_records(session_id)
+        # El storage proyecta solo USER_INPUT / AGENT_RESPONSE y los campos
+        # query/response, sin deserializar el resto de los payloads.
+        messages = await self._svc.get_session_messages(session_id)
         history: list[dict] = []
 
-        for rec in records:
-            if rec.event_type == EventType.USER_INPUT:
-                q = (rec.input_payload or {}).get("query", "")
+        for msg in messages:
+            event_type = msg.get("event_type")
+            if event_type == EventType.USER_INPUT:
+                q = msg.get("query") or ""
                 if q:
                     history.append({"role": "human", "content": q})
 
-            elif rec.event_type == EventType.AGENT_RESPONSE:
-                r = (rec.output_payload or {}).get("response", "")
+            elif event_type == EventType.AGENT_RESPONSE:
+                r = msg.get("response") or ""
                 if r:
                     history.append({"role": "assistant", "content": r})
 
@@ -94,11 +95,11 @@ class SessionReplayer:
     async def list_sessions(
         self,
         limit: int = 50,
-        offset: int = 0,
+        before: Optional[str] = None,
         has_error: Optional[bool] = None,
     ) -> list[SessionSummary]:
         return await self._svc.list_sessions(
-            limit=limit, offset=offset, has_error=has_error
+            limit=limit, before=before, has_error=has_error
         )
 
 
@@ -199,7 +200,7 @@ def _fmt_record(rec: AuditRecord) -> str:
             f"     Mensaje: {err.get('message', '-')}"
         )
 
-    return f"\n[#{rec.sequence_num:02d}] {rec.event_type.value} @ {ts}"
+    return f"\n[#{rec.sequence_num:02d}] {rec.event_type} @ {ts}"
 
 
 def _fmt_totals(s: SessionSummary) -> str:
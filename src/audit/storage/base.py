@@ -33,6 +33,26 @@ class BaseAuditStorage(ABC):
         """Retorna todos los registros de una sesión, ordenados por sequence_num."""
         ...
 
+    @abstractmethod
+    async def get_session_records_summary(
+        self, session_id: str
+    ) -> list[AuditRecord]:
+        """
+        Igual que get_session_records pero sin payloads (input/output/error)
+        ni token_usage: solo metadatos para vistas de listado.
+        """
+        ...
+
+    @abstractmethod
+    async def get_session_messages(self, session_id: str) -> list[dict]:
+        """
+        Retorna solo los mensajes usuario/asistente de una sesión, en orden.
+
+        Proyección server-side de get_session_records: cada dict trae
+        event_type, query (USER_INPUT) y response (AGENT_RESPONSE).
+        """
+        ...
+
     @abstractmethod
     async def get_session_summary(self, session_id: str) -> Optional[SessionSummary]:
         """Retorna el resumen de una sesión, o None si no existe."""
@@ -42,12 +62,21 @@ class BaseAuditStorage(ABC):
     async def list_sessions(
         self,
         limit: int = 50,
-        offset: int = 0,
+        before: Optional[str] = None,
         has_error: Optional[bool] = None,
     ) -> list[SessionSummary]:
-        """Lista sesiones con filtrado y paginación opcionales."""
+        """
+        Lista sesiones por created_at descendente.
+
+        Paginación keyset: before es el created_at de la última sesión de
+        la página anterior (None = primera página).
+        """
         ...
 
+    async def flush(self) -> None:
+        """Persiste escrituras encoladas. No-op en backends sin buffer."""
+        return None
+
     @abstractmethod
     async def close(self) -> None:
         """Cierra conexiones y libera recursos."""
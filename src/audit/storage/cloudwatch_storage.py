@@ -10,13 +10,26 @@ Características:
 - Retention policy configurable (default: 90 días)
 
 Log Groups:
-  /comafi/audit/records  → un evento JSON por AuditRecord
+  /comafi/audit/records  → un evento JSON (orjson, compacto) por AuditRecord
   /comafi/audit/sessions → snapshot de SessionSummary (último valor por session_id)
 
 Read path via CloudWatch Logs Insights:
   - get_session_records → filtra por session_id en records log group
+  - get_session_records_summary → proyección sin payloads (vistas de listado)
+  - get_session_messages → proyección de query/response (solo replay)
   - get_session_summary → sort desc + limit 1 en sessions log group
-  - list_sessions       → dedup por session_id en sessions log group
+  - list_sessions       → dedup por session_id en sessions log group,
+                          paginación keyset por created_at (before)
+
+Write path de records (save_record):
+  - save_record solo encola el record (deque) y retorna; la serialización
+    (model_dump + orjson) ocurre fuera del event loop
+  - un thread dedicado drena la cola en lotes (hasta 500 eventos / ~1MB)
+    con un único put_log_events + put_metric_data consolidado por lote
+  - upsert_session deja el último snapshot por session_id en un dict;
+    el mismo thread los escribe deduplicados (un snapshot por sesión/lote)
+  - flush() fuerza el drenado; close() drena lo pendiente antes de
+    liberar los clients
 
 CloudWatch Metrics (namespace: comafi/audit):
   - LatencyMs   (dims: event_type, agent_name)
@@ -27,29 +40,56 @@ CloudWatch Metrics (namespace: comafi/audit):
 from __future__ import annotations
 
 import asyncio
-import json
+import collections
+import threading
 import time
 from datetime import datetime, timezone
 from functools import partial
 from typing import Any, Optional
 
 import boto3
+import orjson
 
 from .base import BaseAuditStorage
-from ..models import AuditRecord, EventType, SessionSummary, TokenUsage
+from ..models import AuditRecord, EventType, SessionSummary
 
 _LOG_GROUP_RECORDS  = "/comafi/audit/records"
 _LOG_GROUP_SESSIONS = "/comafi/audit/sessions"
 _METRICS_NAMESPACE  = "comafi/audit"
 _RETENTION_DAYS     = 90
 _QUERY_TIMEOUT_SEC  = 30
+_POLL_DELAY_MIN_SEC = 0.05
+_POLL_DELAY_MAX_SEC = 1.0
+
+# Límites de la API: put_log_events ≤ 10.000 eventos / 1MB,
+# put_metric_data ≤ 1000 métricas por llamada.
+_DRAIN_BATCH_MAX       = 500
+_DRAIN_BATCH_MAX_BYTES = 900_000
+_LOG_EVENT_OVERHEAD    = 26
+_METRICS_BATCH_MAX     = 1000
+_DRAIN_JOIN_TIMEOUT    = 10
+# Sesiones recordadas para saltear upserts sin cambios (LRU)
+_LAST_SESSIONS_MAX     = 1024
+
+# Campos de AuditRecord que trae get_session_records_summary
+_RECORD_SUMMARY_FIELDS = (
+    "audit_id", "session_id", "sequence_num", "timestamp", "event_type",
+    "agent_name", "model_id", "tool_name", "latency_ms", "is_error",
+    "cache_hit",
+)
+
+# Payloads que se serializan al final del evento: Insights descubre como
+# mucho 200 campos por evento JSON, en orden de aparición, y un payload
+# de LLM_CALL largo dejaría afuera a los metadatos que vinieran después.
+_PAYLOAD_FIELDS = ("input_payload", "output_payload", "error_payload")
 
 
 class CloudWatchAuditStorage(BaseAuditStorage):
     """
     Backend CloudWatch Logs + Metrics para el sistema de auditoría.
 
-    La escritura usa boto3 (síncrono) envuelto en asyncio.run_in_executor.
+    La escritura de records se encola y la drena un thread dedicado en lotes;
+    el resto de las llamadas boto3 (síncronas) van por asyncio.run_in_executor.
     La lectura usa CloudWatch Logs Insights (start_query → polling → resultados).
     """
 
@@ -68,13 +108,42 @@ class CloudWatchAuditStorage(BaseAuditStorage):
         self._metrics: Any = None  # boto3 CloudWatch client
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
+        # Cola de records pendientes: (timestamp_ms, record)
+        self._queue: collections.deque = collections.deque()
+        # Record ya serializado que no entró en el lote anterior
+        self._carry: Optional[tuple[int, str, list]] = None
+        self._wake = threading.Event()
+        self._closing = False
+        self._drainer: Optional[threading.Thread] = None
+        self._ready_streams: set[tuple[str, str]] = set()
+        # Último snapshot pendiente por session_id: {session_id: (ts_ms, summary)}
+        self._pending_sessions: dict[str, tuple[int, SessionSummary]] = {}
+        self._sessions_lock = threading.Lock()
+        # Último snapshot encolado por session_id (para saltear upserts sin
+        # cambios); LRU acotado a las sesiones activas más recientes.
+        # Protegido por _sessions_lock (el drenado lo limpia si falla)
+        self._last_sessions: collections.OrderedDict[str, SessionSummary] = (
+            collections.OrderedDict()
+        )
+        # Serializa el drenado entre el thread dedicado y flush()
+        self._drain_lock = threading.Lock()
+
     async def initialize(self) -> None:
         self._loop = asyncio.get_event_loop()
         self._logs = boto3.client("logs", region_name=self._region)
         self._metrics = boto3.client("cloudwatch", region_name=self._region)
 
-        for group in (self._log_group_records, self._log_group_sessions):
-            await self._run(self._ensure_log_group, group)
+        # Ambos log groups en paralelo: dos round-trips concurrentes al arrancar
+        await asyncio.gather(*(
+            self._run(self._ensure_log_group, group)
+            for group in (self._log_group_records, self._log_group_sessions)
+        ))
+
+        self._closing = False
+        self._drainer = threading.Thread(
+            target=self._drain_loop, name="cw-audit-drain", daemon=True
+        )
+        self._drainer.start()
 
     # ------------------------------------------------------------------
     # Helpers de ejecución en executor
@@ -105,79 +174,133 @@ class CloudWatchAuditStorage(BaseAuditStorage):
         """Log Stream diario: YYYY/MM/DD"""
         return datetime.now(timezone.utc).strftime("%Y/%m/%d")
 
-    def _put_event(self, group: str, message: str) -> None:
-        """Escribe un único evento JSON en el log stream diario."""
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    async def save_record(self, record: AuditRecord) -> None:
+        # La serialización (model_dump + orjson) la hace el thread de drenado:
+        # el event loop solo encola. El record ya está sellado y no se muta.
+        self._queue.append((int(time.time() * 1000), record))
+        self._wake.set()
+
+    def _drain_loop(self) -> None:
+        """Thread dedicado: drena records y sesiones pendientes hasta close()."""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            self._drain_pending()
+            if self._closing:
+                return
+
+    def _drain_pending(self) -> None:
+        """Escribe todo lo encolado: records en lotes y sesiones deduplicadas."""
+        with self._drain_lock:
+            while self._queue or self._carry is not None:
+                batch = self._take_batch()
+                try:
+                    self._flush_records(batch)
+                except Exception as exc:
+                    # Audit nunca rompe el flujo principal
+                    print(f"[CW] Error drenando {len(batch)} records: {exc}")
+
+            with self._sessions_lock:
+                pending = self._pending_sessions
+                self._pending_sessions = {}
+            if pending:
+                # put_log_events exige orden cronológico dentro del lote
+                sessions = sorted(
+                    (ts_ms, _dump(snapshot.model_dump(mode="json")))
+                    for ts_ms, snapshot in pending.values()
+                )
+                try:
+                    self._put_events(self._log_group_sessions, sessions)
+                except Exception as exc:
+                    print(f"[CW] Error drenando {len(sessions)} sesiones: {exc}")
+                    # Sin olvidar el snapshot, el próximo upsert idéntico se
+                    # saltearía y la sesión no llegaría nunca a CloudWatch.
+                    # Solo si sigue siendo el mismo: uno más nuevo ya está
+                    # encolado de nuevo.
+                    with self._sessions_lock:
+                        for session_id, (_, snapshot) in pending.items():
+                            if self._last_sessions.get(session_id) is snapshot:
+                                del self._last_sessions[session_id]
+
+    def _take_batch(self) -> list[tuple[int, str, list]]:
+        """
+        Saca de la cola y serializa un lote dentro de los límites de
+        put_log_events. Un record que no entra queda en _carry para el
+        próximo lote.
+        """
+        batch: list[tuple[int, str, list]] = []
+        size = 0
+        while len(batch) < _DRAIN_BATCH_MAX:
+            if self._carry is not None:
+                item, self._carry = self._carry, None
+            elif self._queue:
+                ts_ms, record = self._queue.popleft()
+                item = (ts_ms, _serialize_record(record), _metric_data(record))
+            else:
+                break
+            item_size = len(item[1].encode()) + _LOG_EVENT_OVERHEAD
+            if batch and size + item_size > _DRAIN_BATCH_MAX_BYTES:
+                self._carry = item
+                break
+            batch.append(item)
+            size += item_size
+        return batch
+
+    def _put_events(self, group: str, events: list[tuple[int, str]]) -> None:
+        """Un único put_log_events al stream diario (creado una sola vez)."""
         stream = self._daily_stream()
-        self._ensure_log_stream(group, stream)
-        ts_ms = int(time.time() * 1000)
+        if (group, stream) not in self._ready_streams:
+            self._ensure_log_stream(group, stream)
+            self._ready_streams.add((group, stream))
         self._logs.put_log_events(
             logGroupName=group,
             logStreamName=stream,
-            logEvents=[{"timestamp": ts_ms, "message": message}],
+            logEvents=[
+                {"timestamp": ts_ms, "message": message}
+                for ts_ms, message in events
+            ],
         )
 
-    # ------------------------------------------------------------------
-    # Write path
-    # ------------------------------------------------------------------
+    def _flush_records(self, batch: list[tuple[int, str, list]]) -> None:
+        """Un put_log_events por lote + put_metric_data consolidado."""
+        self._put_events(
+            self._log_group_records,
+            [(ts_ms, message) for ts_ms, message, _ in batch],
+        )
 
-    async def save_record(self, record: AuditRecord) -> None:
-        payload = record.model_dump(mode="json")
-        payload["event_type"] = record.event_type.value
-        if record.token_usage:
-            payload["token_usage"] = record.token_usage.model_dump()
-        message = json.dumps(payload, default=str)
-
-        await self._run(self._put_event, self._log_group_records, message)
-        await self._run(self._publish_metrics, record)
-
-    def _publish_metrics(self, record: AuditRecord) -> None:
-        """Publica métricas numéricas en CloudWatch Metrics."""
-        metric_data = []
-        dims = [{"Name": "event_type", "Value": record.event_type.value}]
-        if record.agent_name:
-            dims.append({"Name": "agent_name", "Value": record.agent_name})
-
-        if record.latency_ms is not None:
-            metric_data.append({
-                "MetricName": "LatencyMs",
-                "Dimensions": dims,
-                "Value": float(record.latency_ms),
-                "Unit": "Milliseconds",
-            })
-
-        if record.token_usage:
-            metric_data.append({
-                "MetricName": "InputTokens",
-                "Dimensions": dims,
-                "Value": float(record.token_usage.input_tokens),
-                "Unit": "Count",
-            })
-            metric_data.append({
-                "MetricName": "OutputTokens",
-                "Dimensions": dims,
-                "Value": float(record.token_usage.output_tokens),
-                "Unit": "Count",
-            })
-
-        if record.is_error:
-            metric_data.append({
-                "MetricName": "ErrorCount",
-                "Dimensions": dims,
-                "Value": 1.0,
-                "Unit": "Count",
-            })
-
-        if metric_data:
+        metric_data = [m for _, _, metrics in batch for m in metrics]
+        for i in range(0, len(metric_data), _METRICS_BATCH_MAX):
             self._metrics.put_metric_data(
                 Namespace=_METRICS_NAMESPACE,
-                MetricData=metric_data,
+                MetricData=metric_data[i:i + _METRICS_BATCH_MAX],
             )
 
     async def upsert_session(self, summary: SessionSummary) -> None:
-        """Escribe el estado actual de la sesión en el log group de sessions."""
-        payload = summary.model_dump(mode="json")
-        message = json.dumps(payload, default=str)
-        await self._run(self._put_event, self._log_group_sessions, message)
+        """Encola el estado actual de la sesión (pisa el snapshot pendiente)."""
+        # Sin cambios respecto del último snapshot encolado → nada que escribir
+        if self._last_sessions.get(summary.session_id) == summary:
+            return
+        # AuditService muta el summary en memoria: se encola una copia y
+        # solo el último snapshot por sesión llega a serializarse.
+        snapshot = summary.model_copy()
+        with self._sessions_lock:
+            self._last_sessions[summary.session_id] = snapshot
+            self._last_sessions.move_to_end(summary.session_id)
+            if len(self._last_sessions) > _LAST_SESSIONS_MAX:
+                self._last_sessions.popitem(last=False)
+            self._pending_sessions[summary.session_id] = (
+                int(time.time() * 1000), snapshot
+            )
+        self._wake.set()
+
+    async def flush(self) -> None:
+        """Escribe ya todos los records y sesiones pendientes."""
+        if self._logs is not None:
+            await self._run(self._drain_pending)
 
     # ------------------------------------------------------------------
     # Read path — CloudWatch Logs Insights
@@ -193,6 +316,10 @@ class CloudWatchAuditStorage(BaseAuditStorage):
         Ejecuta una query de CloudWatch Logs Insights y espera el resultado.
         Timeout: _QUERY_TIMEOUT_SEC segundos.
 
+        El polling arranca sin espera y aplica backoff exponencial
+        (50ms → 1s): las queries chicas de una sesión suelen completar
+        en pocos cientos de ms y no deberían esperar un segundo entero.
+
         start_time siempre se acota al retention configurado - 1 día para
         evitar MalformedQueryException cuando el rango excede la retención
         o cae antes de la creación del log group.
@@ -219,6 +346,7 @@ class CloudWatchAuditStorage(BaseAuditStorage):
         query_id = resp["queryId"]
 
         deadline = time.time() + _QUERY_TIMEOUT_SEC
+        delay = _POLL_DELAY_MIN_SEC
         while time.time() < deadline:
             try:
                 result = await self._run(
@@ -236,15 +364,17 @@ class CloudWatchAuditStorage(BaseAuditStorage):
                     {item["field"]: item["value"] for item in row}
                     for row in result.get("results", [])
                 ]
-            await asyncio.sleep(1)
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.7, _POLL_DELAY_MAX_SEC)
 
         return []
 
     async def get_session_records(self, session_id: str) -> list[AuditRecord]:
-        # like hace substring search sobre el JSON crudo — nunca descarta filas
+        # like hace búsqueda sobre el JSON crudo — nunca descarta filas.
+        # La regex acepta ":" con o sin espacio (json.dumps histórico vs orjson)
         query = (
             "fields @message"
-            f' | filter @message like \'"session_id": "{session_id}"\''
+            f' | filter @message like /"session_id":\\s*"{session_id}"/'
             " | sort @timestamp asc"
             " | limit 1000"
         )
@@ -252,7 +382,7 @@ class CloudWatchAuditStorage(BaseAuditStorage):
         records = []
         for row in rows:
             try:
-                data = json.loads(row.get("@message", "{}"))
+                data = _load(row.get("@message", "{}"))
                 # Verificar que el session_id corresponde exactamente
                 if data.get("session_id") == session_id:
                     records.append(_dict_to_record(data))
@@ -260,10 +390,59 @@ class CloudWatchAuditStorage(BaseAuditStorage):
                 pass
         return records
 
+    async def get_session_records_summary(
+        self, session_id: str
+    ) -> list[AuditRecord]:
+        # Proyección en Insights: solo metadatos, sin los payloads JSON.
+        # El filtro es el mismo like sobre @message de get_session_records
+        # (no depende de que Insights haya descubierto session_id).
+        query = (
+            f"fields {', '.join(_RECORD_SUMMARY_FIELDS)}"
+            f' | filter @message like /"session_id":\\s*"{session_id}"/'
+            " | sort @timestamp asc"
+            " | limit 1000"
+        )
+        rows = await self._run_insights_query(self._log_group_records, query)
+        # is_error siempre se serializa: si falta en una fila, Insights no
+        # llegó a descubrirlo (record escrito con los payloads antes de los
+        # metadatos) → la proyección no es confiable, leer los records.
+        if any("is_error" not in row for row in rows):
+            return await self.get_session_records(session_id)
+        records = []
+        for row in rows:
+            try:
+                records.append(AuditRecord.model_validate({
+                    k: v for k, v in row.items() if k in _RECORD_SUMMARY_FIELDS
+                }))
+            except Exception:
+                pass
+        return records
+
+    async def get_session_messages(self, session_id: str) -> list[dict]:
+        # Proyección en Insights: solo los campos que usa el replay,
+        # sin traer @message completo (payloads de LLM/tool calls).
+        query = (
+            "fields event_type, input_payload.query, output_payload.response"
+            f' | filter session_id = "{session_id}"'
+            f' and (event_type = "{EventType.USER_INPUT}"'
+            f' or event_type = "{EventType.AGENT_RESPONSE}")'
+            " | sort @timestamp asc"
+            " | limit 1000"
+        )
+        rows = await self._run_insights_query(self._log_group_records, query)
+        return [
+            {
+                "event_type": row.get("event_type"),
+                "query": row.get("input_payload.query"),
+                "response": row.get("output_payload.response"),
+            }
+            for row in rows
+        ]
+
     async def get_session_summary(self, session_id: str) -> Optional[SessionSummary]:
         query = (
             "fields @message"
-            f' | filter @message like \'"session_id": "{session_id}"\''
+            f' | filter @message like /"session_id":\\s*"{session_id}"/'
             " | sort @timestamp desc"
             " | limit 1"
         )
@@ -271,7 +450,7 @@ class CloudWatchAuditStorage(BaseAuditStorage):
         if not rows:
             return None
         try:
-            data = json.loads(rows[0].get("@message", "{}"))
+            data = _load(rows[0].get("@message", "{}"))
             return _dict_to_summary(data)
         except Exception:
             return None
@@ -279,7 +458,7 @@ class CloudWatchAuditStorage(BaseAuditStorage):
     async def list_sessions(
         self,
         limit: int = 50,
-        offset: int = 0,
+        before: Optional[str] = None,
         has_error: Optional[bool] = None,
     ) -> list[SessionSummary]:
         # Traer más eventos de los necesarios y deduplicar en Python
@@ -287,34 +466,57 @@ class CloudWatchAuditStorage(BaseAuditStorage):
         error_filter = ""
         if has_error is not None:
             val = "true" if has_error else "false"
-            error_filter = f' | filter @message like \'"has_error": {val}\''
-
-        fetch_limit = (limit + offset) * 5  # margen para dedup
+            error_filter = f' | filter @message like /"has_error":\\s*{val}/'
+
+        # Keyset: created_at ISO-8601 UTC ordena lexicográficamente, así que
+        # cada página cuesta lo mismo sin importar su profundidad (sin OFFSET).
+        cursor_filter = ""
+        if before:
+            cursor_filter = f' | filter created_at < "{before}"'
+
+        # Orden por created_at (el mismo campo que el cursor): con
+        # @timestamp, una sesión creada antes del cursor pero actualizada
+        # después podía quedar fuera de la ventana de una página y ser
+        # filtrada por created_at < before en todas las siguientes.
+        fetch_limit = limit * 5  # margen para dedup
         query = (
-            "fields @message"
+            "fields @timestamp, @message"
             f"{error_filter}"
-            " | sort @timestamp desc"
+            f"{cursor_filter}"
+            " | sort created_at desc"
             f" | limit {fetch_limit}"
         )
         rows = await self._run_insights_query(self._log_group_sessions, query)
 
-        # Dedup en Python: quedarse con el snapshot más reciente por session_id
-        seen: set = set()
-        summaries: list[SessionSummary] = []
+        # Dedup en Python: los snapshots de una sesión comparten created_at,
+        # así que el más reciente se elige por @timestamp.
+        latest: dict[str, tuple[str, dict]] = {}
         for row in rows:
+            data = _load(row.get("@message", "{}"))
+            sid = data.get("session_id")
+            if not sid:
+                continue
+            ts = row.get("@timestamp", "")
+            if sid not in latest or ts > latest[sid][0]:
+                latest[sid] = (ts, data)
+
+        summaries: list[SessionSummary] = []
+        for _, data in latest.values():
             try:
-                data = json.loads(row.get("@message", "{}"))
-                sid = data.get("session_id")
-                if not sid or sid in seen:
-                    continue
-                seen.add(sid)
                 summaries.append(_dict_to_summary(data))
             except Exception:
                 pass
 
-        return summaries[offset: offset + limit]
+        summaries.sort(key=lambda s: s.created_at, reverse=True)
+        return summaries[:limit]
 
     async def close(self) -> None:
+        # Drenar records pendientes antes de soltar los clients
+        if self._drainer is not None:
+            self._closing = True
+            self._wake.set()
+            await self._run(self._drainer.join, _DRAIN_JOIN_TIMEOUT)
+            self._drainer = None
         # boto3 clients no requieren cierre explícito
         self._logs = None
         self._metrics = None
@@ -324,50 +526,77 @@ class CloudWatchAuditStorage(BaseAuditStorage):
 # Helpers de deserialización
 # --------------------------------------------------------------------------
 
-def _dict_to_record(d: dict) -> AuditRecord:
-    token_usage = None
-    tu = d.get("token_usage")
-    if tu and isinstance(tu, dict):
-        token_usage = TokenUsage(
-            input_tokens=tu.get("input_tokens", 0),
-            output_tokens=tu.get("output_tokens", 0),
-            total_tokens=tu.get("total_tokens", 0),
-        )
+def _metric_data(record: AuditRecord) -> list[dict]:
+    """Métricas numéricas de un record para CloudWatch Metrics."""
+    metric_data = []
+    dims = [{"Name": "event_type", "Value": record.event_type}]
+    if record.agent_name:
+        dims.append({"Name": "agent_name", "Value": record.agent_name})
+
+    if record.latency_ms is not None:
+        metric_data.append({
+            "MetricName": "LatencyMs",
+            "Dimensions": dims,
+            "Value": float(record.latency_ms),
+            "Unit": "Milliseconds",
+        })
+
+    if record.token_usage:
+        metric_data.append({
+            "MetricName": "InputTokens",
+            "Dimensions": dims,
+            "Value": float(record.token_usage.input_tokens),
+            "Unit": "Count",
+        })
+        metric_data.append({
+            "MetricName": "OutputTokens",
+            "Dimensions": dims,
+            "Value": float(record.token_usage.output_tokens),
+            "Unit": "Count",
+        })
+
+    if record.is_error:
+        metric_data.append({
+            "MetricName": "ErrorCount",
+            "Dimensions": dims,
+            "Value": 1.0,
+            "Unit": "Count",
+        })
+
+    return metric_data
+
+
+def _dump(obj: Any) -> str:
+    """Serializa a JSON compacto con orjson (Rust) — hot path de escritura."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _serialize_record(record: AuditRecord) -> str:
+    # mode="json" ya emite event_type como str y token_usage como dict
+    data = record.model_dump(mode="json")
+    # Metadatos primero, payloads al final (ver _PAYLOAD_FIELDS)
+    for field in _PAYLOAD_FIELDS:
+        data[field] = data.pop(field)
+    return _dump(data)
+
+
+def _load(s: str) -> dict:
+    """Deserializa un @message; si no es JSON válido lo conserva en _raw."""
+    try:
+        return orjson.loads(s)
+    except orjson.JSONDecodeError:
+        return {"_raw": s}
+
 
-    return AuditRecord(
-        audit_id=d["audit_id"],
-        session_id=d["session_id"],
-        sequence_num=d.get("sequence_num", 0),
-        timestamp=d["timestamp"],
-        event_type=EventType(d["event_type"]),
-        agent_name=d.get("agent_name"),
-        model_id=d["model_id"],
-        prompt_name=d.get("prompt_name"),
-        prompt_version=d.get("prompt_version"),
-        prompt_hash=d.get("prompt_hash"),
-        input_payload=d.get("input_payload"),
-        output_payload=d.get("output_payload"),
-        tool_name=d.get("tool_name"),
-        latency_ms=d.get("latency_ms"),
-        token_usage=token_usage,
-        cache_hit=d.get("cache_hit"),
-        is_error=bool(d.get("is_error", False)),
-        error_payload=d.get("error_payload"),
-        content_hash=d.get("content_hash"),
-    )
+def _dict_to_record(d: dict) -> AuditRecord:
+    # model_validate coerciona event_type (str → EventType) y token_usage
+    # (dict → TokenUsage) en pydantic-core, sin rearmar campo por campo.
+    if d.get("token_usage") is not None and not isinstance(d["token_usage"], dict):
+        d = {**d, "token_usage": None}
+    return AuditRecord.model_validate(d)
 
 
 def _dict_to_summary(d: dict) -> SessionSummary:
-    return SessionSummary(
-        session_id=d["session_id"],
-        created_at=d["created_at"],
-        model_id=d["model_id"],
-        prompt_versions=d.get("prompt_versions") or {},
-        total_records=d.get("total_records", 0),
-        total_latency_ms=d.get("total_latency_ms", 0),
-        total_input_tokens=d.get("total_input_tokens", 0),
-        total_output_tokens=d.get("total_output_tokens", 0),
-        has_error=bool(d.get("has_error", False)),
-        user_query=d.get("user_query"),
-        final_response=d.get("final_response"),
-    )
+    if d.get("prompt_versions") is None:
+        d = {**d, "prompt_versions": {}}
+    return SessionSummary.model_validate(d)
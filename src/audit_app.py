@@ -4,6 +4,17 @@ Audit Dashboard — Entry point standalone para el panel de auditoría.
 Lanzar con:
     python -m src.audit_app
     python -m src.audit_app --port 7861 --host 0.0.0.0
+    python -m src.audit_app --legacy-launch --share   # demo.launch() de Gradio
+
+Por defecto el dashboard se monta sobre una app FastAPI y se sirve con
+uvicorn (uvloop + httptools cuando están disponibles, vía uvicorn[standard])
+en un solo worker: Gradio guarda la cola y el estado de sesión en memoria
+del proceso, así que varios workers rompen las conexiones (ver
+docker-entrypoint.sh). --legacy-launch conserva el demo.launch() original,
+necesario para --share.
+
+En Linux/macOS se usa uvloop como event loop (viene con uvicorn[standard]);
+en Windows, o si no está instalado, se sigue con el loop default de asyncio.
 """
 
 import argparse
@@ -19,9 +30,60 @@ def parse_args():
     parser.add_argument("--port", type=int, default=7861)
     parser.add_argument("--host", type=str, default="127.0.0.1")
     parser.add_argument("--share", action="store_true")
+    parser.add_argument(
+        "--legacy-launch",
+        action="store_true",
+        help="Usar demo.launch() de Gradio en lugar de uvicorn",
+    )
     return parser.parse_args()
 
 
+def create_app():
+    """Factory para uvicorn: dashboard Gradio montado en / de una app FastAPI."""
+    import gradio as gr
+    from fastapi import FastAPI
+
+    app = FastAPI(title="Audit Dashboard — TeVaBien AI")
+    return gr.mount_gradio_app(app, create_audit_interface(), path="/")
+
+
+def _install_uvloop() -> None:
+    """Instala la policy de uvloop si está disponible (no existe en Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
+
+
+def _legacy_launch(args) -> None:
+    _install_uvloop()
+    demo = create_audit_interface()
+    demo.launch(
+        server_name=args.host,
+        server_port=args.port,
+        share=args.share,
+        show_error=True,
+        show_api=False,
+    )
+
+
+def _serve(args) -> None:
+    import uvicorn
+
+    uvicorn.run(
+        "src.audit_app:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        loop="auto",   # uvloop si está instalado
+        http="auto",   # httptools si está instalado
+        # Un solo proceso: Gradio guarda cola y sesiones en memoria. Para
+        # escalar, varias instancias con sticky sessions.
+        workers=1,
+    )
+
+
 def main():
     args = parse_args()
 
@@ -33,14 +95,10 @@ def main():
     print("=" * 70 + "\n")
 
     try:
-        demo = create_audit_interface()
-        demo.launch(
-            server_name=args.host,
-            server_port=args.port,
-            share=args.share,
-            show_error=True,
-            show_api=False,
-        )
+        if args.legacy_launch or args.share:
+            _legacy_launch(args)
+        else:
+            _serve(args)
     except KeyboardInterrupt:
         print("\n\n👋 Audit Dashboard detenido.")
         sys.exit(0)
@@ -3,16 +3,64 @@ Cache Service - Servicio genérico de caché async con Redis.
 
 Proporciona una API simple para cachear datos con TTL,
 con fallback graceful si Redis no está disponible.
+
+Auto-pipelining: los get() concurrentes emitidos en el mismo tick del
+event loop se agrupan en un único MGET (un round-trip en vez de N).
+Write-behind: set() encola y retorna; los SETEX del tick se envían en un
+único pipeline. get()/mget()/exists()/get_ttl() de una clave aún no
+escrita ven el valor encolado (read-your-writes).
+drain() espera a que se escriban los pendientes (tests / shutdown).
+
+Fail-open: los valores escritos con set()/mset() se guardan también en un
+LRU en proceso que get() usa solo cuando Redis no está disponible o falla.
+Cada entrada vence a los min(ttl, CACHE_LOCAL_TTL) segundos (default 300s)
+y el LRU se acota en bytes serializados (CACHE_LOCAL_MAX_BYTES, default
+8 MB; valores de más de 1/8 del total no entran). Las lecturas no lo
+pueblan (no conocen el TTL de la clave) y un miss de Redis lo invalida.
+
+Serialización: msgpack por defecto (payloads ~30-50% más chicos que JSON);
+CACHE_SERIALIZATION_FORMAT=json usa orjson, útil para inspeccionar Redis
+a mano. Cada valor lleva un prefijo de formato (b"m:" / b"j:") para que
+convivan valores de ambos formatos — y los JSON legacy sin prefijo —
+durante un rollout.
 """
 
+import asyncio
 import hashlib
-import json
 import os
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
 from functools import wraps
 from typing import Any, Callable, Optional
 
+import msgpack
+import orjson
+
 from .redis_client import get_redis_client
 
+# HIT/MISS del decorador @cached: solo con CACHE_DEBUG=true (hot path)
+_CACHE_DEBUG = os.getenv("CACHE_DEBUG", "false").lower() == "true"
+
+_MSGPACK_TAG = b"m:"
+_JSON_TAG = b"j:"
+
+
+def _encode(value: Any, fmt: str) -> bytes:
+    """Serializa un valor con el formato configurado + prefijo de formato."""
+    if fmt == "json":
+        return _JSON_TAG + orjson.dumps(value, default=str)
+    return _MSGPACK_TAG + msgpack.packb(value, use_bin_type=True, default=str)
+
+
+def _decode(raw: bytes) -> Any:
+    """Deserializa según el prefijo; sin prefijo = JSON legacy."""
+    if raw[:2] == _MSGPACK_TAG:
+        return msgpack.unpackb(raw[2:], raw=False)
+    if raw[:2] == _JSON_TAG:
+        return orjson.loads(raw[2:])
+    return orjson.loads(raw)
+
 
 class CacheService:
     """
@@ -28,13 +76,47 @@ class CacheService:
     # Prefijo para todas las keys
     KEY_PREFIX = "comafi:"
 
+    # Página de SCAN y tamaño de lote de UNLINK en clear_pattern
+    DEFAULT_SCAN_COUNT = 1000
+    UNLINK_BATCH = 500
+
+    # LRU en proceso para servir con Redis caído
+    LOCAL_MAX_ENTRIES = 1024
+    DEFAULT_LOCAL_TTL = 300
+    DEFAULT_LOCAL_MAX_BYTES = 8 * 1024 * 1024
+
     def __init__(self):
         """Inicializa el servicio de caché."""
         self._redis = None
         self._default_ttl = int(
             os.getenv("CACHE_TTL_DEFAULT", str(self.DEFAULT_TTL))
         )
+        self._scan_count = int(
+            os.getenv("CACHE_SCAN_COUNT", str(self.DEFAULT_SCAN_COUNT))
+        )
+        self._format = os.getenv("CACHE_SERIALIZATION_FORMAT", "msgpack").lower()
         self._initialized = False
+        self._kprefix = self.KEY_PREFIX
+        # get() pendientes del tick actual: [(full_key, future)]
+        self._get_batch: list[tuple[str, asyncio.Future]] = []
+        self._get_batch_loop: Optional[asyncio.AbstractEventLoop] = None
+        # set() pendientes del tick actual: {full_key: (payload, ttl)}
+        self._write_queue: dict[str, tuple[bytes, int]] = {}
+        self._write_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Flushes agendados o en vuelo (drain() los espera a todos)
+        self._flush_tasks: set[asyncio.Task] = set()
+        # SETEX ya enviados en un pipeline, sin respuesta todavía
+        self._inflight_writes: dict[str, tuple[bytes, int]] = {}
+        # Fallback en proceso: {key: (expira_monotonic, valor)}
+        # Fallback en proceso: {key: (expira_monotonic, valor, bytes)}
+        self._local: OrderedDict[str, tuple[float, Any, int]] = OrderedDict()
+        self._local_bytes = 0
+        self._local_ttl = int(
+            os.getenv("CACHE_LOCAL_TTL", str(self.DEFAULT_LOCAL_TTL))
+        )
+        self._local_max_bytes = int(
+            os.getenv("CACHE_LOCAL_MAX_BYTES", str(self.DEFAULT_LOCAL_MAX_BYTES))
+        )
 
     async def initialize(self) -> None:
         """Inicializa la conexión async a Redis."""
@@ -58,7 +140,7 @@ class CacheService:
         Returns:
             Key con prefijo
         """
-        return f"{self.KEY_PREFIX}{key}"
+        return self._kprefix + key
 
     async def get(self, key: str) -> Optional[Any]:
         """
@@ -71,20 +153,135 @@ class CacheService:
             Valor deserializado o None si no existe
         """
         if not await self.is_available():
-            return None
+            return self._local_get(key)
 
         try:
             full_key = self._make_key(key)
-            value = await self._redis.client.get(full_key)
+            value = await self._batched_get(full_key)
 
             if value is None:
+                # La clave ya no existe (venció o la borraron): el fallback
+                # no debe resucitarla si Redis cae después
+                self._local_drop(key)
                 return None
 
-            # Deserializar JSON
-            return json.loads(value)
+            return _decode(value)
         except Exception as e:
+            self._redis.mark_unhealthy()
             print(f"[Cache] Error en get({key}): {e}")
+            return self._local_get(key)
+
+    def _local_get(self, key: str) -> Optional[Any]:
+        """Último valor conocido de key, si no expiró (solo con Redis caído)."""
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires, value, _ = entry
+        if time.monotonic() > expires:
+            self._local_drop(key)
             return None
+        return value
+
+    def _local_put(self, key: str, value: Any, ttl: int, size: int) -> None:
+        """Guarda value (size bytes serializado) sin superar su TTL."""
+        self._local_drop(key)
+        if size > self._local_max_bytes // 8:
+            return
+        expires = time.monotonic() + min(ttl, self._local_ttl)
+        self._local[key] = (expires, value, size)
+        self._local_bytes += size
+        while (
+            len(self._local) > self.LOCAL_MAX_ENTRIES
+            or self._local_bytes > self._local_max_bytes
+        ):
+            _, (_, _, evicted) = self._local.popitem(last=False)
+            self._local_bytes -= evicted
+
+    def _local_drop(self, key: str) -> None:
+        entry = self._local.pop(key, None)
+        if entry is not None:
+            self._local_bytes -= entry[2]
+
+    def _pending_write(self, full_key: str) -> Optional[tuple[bytes, int]]:
+        """(payload, ttl) de un set() que todavía no llegó a Redis."""
+        return (
+            self._write_queue.get(full_key)
+            or self._inflight_writes.get(full_key)
+        )
+
+    def _batched_get(self, full_key: str) -> "asyncio.Future":
+        """
+        Encola un GET en el batch del tick actual. El primer get() del tick
+        agenda el flush; los siguientes se suman al mismo MGET.
+        """
+        loop = asyncio.get_running_loop()
+        pending = self._pending_write(full_key)
+        if pending is not None:
+            # Read-your-writes: el SETEX todavía no salió en el pipeline
+            fut = loop.create_future()
+            fut.set_result(pending[0])
+            return fut
+        if self._get_batch and self._get_batch_loop is not loop:
+            if self._get_batch_loop.is_closed():
+                # El loop del batch murió antes del MGET: nadie espera
+                # esos futures, se descartan y el batch arranca acá
+                self._get_batch = []
+            else:
+                # Batch pendiente de otro event loop: GET directo
+                return asyncio.ensure_future(self._redis.client.get(full_key))
+
+        fut = loop.create_future()
+        if not self._get_batch:
+            self._get_batch_loop = loop
+            loop.create_task(self._flush_gets())
+        self._get_batch.append((full_key, fut))
+        return fut
+
+    async def _flush_gets(self) -> None:
+        """Resuelve todos los get() encolados con un único MGET."""
+        batch, self._get_batch = self._get_batch, []
+        self._get_batch_loop = None
+        keys = list(dict.fromkeys(k for k, _ in batch))
+        try:
+            values = await self._redis.client.mget(*keys)
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        by_key = dict(zip(keys, values))
+        for full_key, fut in batch:
+            if not fut.done():
+                fut.set_result(by_key[full_key])
+
+    async def mget(self, keys: list[str]) -> list[Optional[Any]]:
+        """
+        Obtiene varios valores del caché en un solo round-trip (MGET).
+
+        Args:
+            keys: Claves a buscar
+
+        Returns:
+            Lista de valores deserializados (None para los que no existen),
+            en el mismo orden que keys
+        """
+        if not keys or not await self.is_available():
+            return [None] * len(keys)
+
+        try:
+            full_keys = [self._make_key(k) for k in keys]
+            values = await self._redis.client.mget(*full_keys)
+            # Read-your-writes: los set() pendientes pisan lo leído
+            for i, full_key in enumerate(full_keys):
+                pending = self._pending_write(full_key)
+                if pending is not None:
+                    values[i] = pending[0]
+            return [None if v is None else _decode(v) for v in values]
+        except Exception as e:
+            self._redis.mark_unhealthy()
+            print(f"[Cache] Error en mget({len(keys)} keys): {e}")
+            return [None] * len(keys)
 
     async def set(
         self,
@@ -97,7 +294,7 @@ class CacheService:
 
         Args:
             key: Clave para almacenar
-            value: Valor a almacenar (será serializado a JSON)
+            value: Valor a almacenar (serializado con msgpack/JSON)
             ttl: Tiempo de vida en segundos (default: 24h)
 
         Returns:
@@ -109,14 +306,123 @@ class CacheService:
         try:
             full_key = self._make_key(key)
             ttl = ttl or self._default_ttl
+            payload = _encode(value, self._format)
+            self._local_put(key, value, ttl, len(payload))
+
+            loop = asyncio.get_running_loop()
+            if self._write_queue and self._write_loop is not loop:
+                if self._write_loop.is_closed():
+                    # El loop dueño de la cola terminó antes del flush (p.ej.
+                    # un asyncio.run): la cola se adopta y sale desde acá
+                    self._adopt_write_queue(loop)
+                else:
+                    # Cola pendiente de otro event loop: SETEX directo, y el
+                    # valor encolado para esta clave (más viejo) se descarta
+                    # para que las lecturas no lo sigan sirviendo
+                    self._write_queue.pop(full_key, None)
+                    await self._redis.client.setex(full_key, ttl, payload)
+                    return True
+
+            if not self._write_queue:
+                self._schedule_flush(loop)
+            self._write_queue[full_key] = (payload, ttl)
+            return True
+        except Exception as e:
+            self._redis.mark_unhealthy()
+            print(f"[Cache] Error en set({key}): {e}")
+            return False
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._write_loop = loop
+        task = loop.create_task(self._flush_writes())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def _adopt_write_queue(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Reagenda en loop el flush de una cola cuyo loop ya cerró."""
+        for task in [
+            t for t in self._flush_tasks if t.get_loop().is_closed()
+        ]:
+            self._flush_tasks.discard(task)
+        self._schedule_flush(loop)
+
+    async def _flush_writes(self) -> None:
+        """Envía todos los set() encolados en un único pipeline."""
+        queue, self._write_queue = self._write_queue, {}
+        self._write_loop = None
+        if not queue:
+            return
+        self._inflight_writes.update(queue)
+        try:
+            pipe = self._redis.client.pipeline(transaction=False)
+            for full_key, (payload, ttl) in queue.items():
+                pipe.setex(full_key, ttl, payload)
+            await pipe.execute()
+        except Exception as e:
+            self._redis.mark_unhealthy()
+            print(f"[Cache] Error en flush de {len(queue)} set(): {e}")
+        finally:
+            # Solo las entradas de este lote (otro flush pudo pisarlas)
+            for full_key, entry in queue.items():
+                if self._inflight_writes.get(full_key) is entry:
+                    del self._inflight_writes[full_key]
+
+    async def drain(self) -> None:
+        """
+        Espera a que se escriban los set() pendientes de este event loop
+        (shutdown de la app / tests).
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            tasks = [t for t in self._flush_tasks if t.get_loop() is loop]
+            if not tasks:
+                return
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _discard_pending(self, full_keys) -> None:
+        """
+        Saca full_keys de la cola write-behind antes de un UNLINK. Si alguna
+        ya salió en un pipeline, espera ese flush: si no, el SETEX podría
+        llegar a Redis después del UNLINK y resucitar la clave.
+        """
+        inflight = False
+        for full_key in full_keys:
+            self._write_queue.pop(full_key, None)
+            if self._inflight_writes.pop(full_key, None) is not None:
+                inflight = True
+        if inflight:
+            await self.drain()
+
+    async def mset(
+        self,
+        items: dict[str, Any],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Guarda varios valores en el caché en un solo round-trip (pipeline).
+
+        Args:
+            items: Diccionario clave → valor (serializado con msgpack/JSON)
+            ttl: Tiempo de vida en segundos (default: 24h)
 
-            # Serializar a JSON
-            serialized = json.dumps(value, ensure_ascii=False)
+        Returns:
+            True si se guardaron exitosamente
+        """
+        if not items or not await self.is_available():
+            return False
 
-            await self._redis.client.setex(full_key, ttl, serialized)
+        try:
+            ttl = ttl or self._default_ttl
+            pipe = self._redis.client.pipeline(transaction=False)
+            for key, value in items.items():
+                payload = _encode(value, self._format)
+                pipe.setex(self._make_key(key), ttl, payload)
+                self._local_put(key, value, ttl, len(payload))
+            await pipe.execute()
             return True
         except Exception as e:
-            print(f"[Cache] Error en set({key}): {e}")
+            self._redis.mark_unhealthy()
+            print(f"[Cache] Error en mset({len(items)} keys): {e}")
             return False
 
     async def delete(self, key: str) -> bool:
@@ -129,14 +435,19 @@ class CacheService:
         Returns:
             True si se eliminó exitosamente
         """
+        self._local_drop(key)
         if not await self.is_available():
             return False
 
         try:
             full_key = self._make_key(key)
-            await self._redis.client.delete(full_key)
+            # Un SETEX write-behind pendiente no debe resucitar la clave
+            await self._discard_pending((full_key,))
+            # UNLINK: la memoria se libera en un thread de fondo de Redis
+            await self._redis.client.unlink(full_key)
             return True
         except Exception as e:
+            self._redis.mark_unhealthy()
             print(f"[Cache] Error en delete({key}): {e}")
             return False
 
@@ -155,8 +466,11 @@ class CacheService:
 
         try:
             full_key = self._make_key(key)
+            if self._pending_write(full_key) is not None:
+                return True
             return bool(await self._redis.client.exists(full_key))
         except Exception:
+            self._redis.mark_unhealthy()
             return False
 
     async def get_ttl(self, key: str) -> int:
@@ -174,30 +488,54 @@ class CacheService:
 
         try:
             full_key = self._make_key(key)
+            pending = self._pending_write(full_key)
+            if pending is not None:
+                # El TTL con el que va a quedar al salir el SETEX
+                return pending[1]
             return await self._redis.client.ttl(full_key)
         except Exception:
+            self._redis.mark_unhealthy()
             return -2
 
     async def clear_pattern(self, pattern: str) -> int:
         """
         Elimina todas las claves que coincidan con un patrón.
 
+        Recorre el keyspace con SCAN (no bloquea Redis como KEYS) y borra
+        en lotes con UNLINK (liberación de memoria en background).
+
         Args:
             pattern: Patrón de búsqueda (ej: "benefits:*")
 
         Returns:
             Número de claves eliminadas
         """
+        self._local.clear()
+        self._local_bytes = 0
         if not await self.is_available():
             return 0
 
         try:
             full_pattern = self._make_key(pattern)
-            keys = await self._redis.client.keys(full_pattern)
-            if keys:
-                return await self._redis.client.delete(*keys)
-            return 0
+            await self._discard_pending([
+                k for k in (*self._write_queue, *self._inflight_writes)
+                if fnmatchcase(k, full_pattern)
+            ])
+            client = self._redis.client
+            deleted = 0
+            batch: list = []
+            async for key in client.scan_iter(
+                match=full_pattern, count=self._scan_count
+            ):
+                batch.append(key)
+                if len(batch) >= self.UNLINK_BATCH:
+                    deleted += await client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await client.unlink(*batch)
+            return deleted
         except Exception as e:
+            self._redis.mark_unhealthy()
             print(f"[Cache] Error en clear_pattern({pattern}): {e}")
             return 0
 
@@ -213,15 +551,19 @@ class CacheService:
             **kwargs: Argumentos nombrados
 
         Returns:
-            Hash MD5 de los argumentos
+            Hash BLAKE2b (128 bits, hex) de los argumentos
         """
-        # Crear representación string de los argumentos
-        key_parts = [str(arg) for arg in args]
-        key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-        key_string = ":".join(key_parts)
-
-        # Generar hash
-        return hashlib.md5(key_string.encode()).hexdigest()
+        # Se alimenta el hash de a partes: sin armar un string intermedio
+        h = hashlib.blake2b(digest_size=16)
+        for arg in args:
+            h.update(repr(arg).encode())
+            h.update(b"\x00")
+        for k in sorted(kwargs):
+            h.update(k.encode())
+            h.update(b"=")
+            h.update(repr(kwargs[k]).encode())
+            h.update(b"\x00")
+        return h.hexdigest()
 
 
 # Instancia global singleton
@@ -263,23 +605,26 @@ def cached(
             return await fetch_user_from_db(user_id)
     """
     def decorator(func: Callable) -> Callable:
+        # Parte fija de la clave: se arma una sola vez al decorar
+        cache_key_base = f"{key_prefix}:{func.__name__}:"
+
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
             cache = await get_cache_service()
 
             # Generar clave única
-            func_name = func.__name__
-            args_hash = CacheService.generate_key(*args, **kwargs)
-            cache_key = f"{key_prefix}:{func_name}:{args_hash}"
+            cache_key = cache_key_base + CacheService.generate_key(*args, **kwargs)
 
             # Intentar obtener del caché
             cached_value = await cache.get(cache_key)
             if cached_value is not None:
-                print(f"[Cache] HIT: {cache_key}")
+                if _CACHE_DEBUG:
+                    print(f"[Cache] HIT: {cache_key}")
                 return cached_value
 
             # Ejecutar función y cachear resultado
-            print(f"[Cache] MISS: {cache_key}")
+            if _CACHE_DEBUG:
+                print(f"[Cache] MISS: {cache_key}")
             result = await func(*args, **kwargs)
 
             if result is not None:
@@ -3,13 +3,25 @@ Redis Client - Conexión singleton async a Redis.
 
 Este módulo proporciona una conexión singleton asíncrona a Redis con manejo
 de errores y reconexión automática.
+
+Usa un BlockingConnectionPool acotado (REDIS_POOL_SIZE, default 32) con
+TCP keepalive y health check cada 30s. Con el pool lleno, un comando
+espera una conexión libre (hasta REDIS_POOL_TIMEOUT segundos, default 5)
+en vez de fallar con "Too many connections"; las conexiones muertas se
+detectan antes de usarlas.
+
+Parser de respuestas: hiredis (C) cuando está instalado — requirements.txt
+lo incluye —; si no, el parser pure-Python de redis-py.
 """
 
 import os
+import time
 from typing import Optional
 
 import redis.asyncio as redis
+from redis.asyncio.connection import DefaultParser
 from redis.exceptions import ConnectionError, TimeoutError
+from redis.utils import HIREDIS_AVAILABLE
 
 
 class RedisClient:
@@ -24,7 +36,11 @@ class RedisClient:
 
     _instance: Optional["RedisClient"] = None
     _client: Optional[redis.Redis] = None
+    _pool: Optional[redis.BlockingConnectionPool] = None
     _initialized: bool = False
+    # Último PING exitoso (monotonic) y cuánto tiempo se confía en él
+    _last_ok_ts: float = 0.0
+    _OK_CACHE_TTL = 1.0
 
     def __new__(cls) -> "RedisClient":
         """Implementa el patrón singleton."""
@@ -46,21 +62,34 @@ class RedisClient:
         db = int(os.getenv("REDIS_DB", "0"))
 
         try:
-            self._client = redis.Redis(
+            self._pool = redis.BlockingConnectionPool(
                 host=host,
                 port=port,
                 password=password if password else None,
                 db=db,
-                decode_responses=True,
+                max_connections=int(os.getenv("REDIS_POOL_SIZE", "32")),
+                # Pool lleno → esperar turno; ConnectionPool plano lanzaría
+                # ConnectionError y el caller caería al fallback.
+                timeout=int(os.getenv("REDIS_POOL_TIMEOUT", "5")),
+                # bytes crudos: CacheService guarda msgpack (binario).
+                # Los consumidores JSON parsean bytes directo: memory con
+                # orjson.loads y user_profile con model_validate_json.
+                decode_responses=False,
                 socket_connect_timeout=5,
                 socket_timeout=5,
+                socket_keepalive=True,
+                health_check_interval=30,
+                # hiredis si está disponible (DefaultParser lo elige)
+                parser_class=DefaultParser,
             )
+            self._client = redis.Redis(connection_pool=self._pool)
             # Verificar conexión
             await self._client.ping()
-            print(f"[Redis] Conectado a {host}:{port} DB:{db}")
+            parser = "hiredis" if HIREDIS_AVAILABLE else "python"
+            print(f"[Redis] Conectado a {host}:{port} DB:{db} (parser: {parser})")
         except (ConnectionError, TimeoutError) as e:
             print(f"[Redis] Error de conexión: {e}")
-            self._client = None
+            await self._disconnect()
 
     @property
     def client(self) -> Optional[redis.Redis]:
@@ -68,20 +97,42 @@ class RedisClient:
         return self._client
 
     async def is_connected(self) -> bool:
-        """Verifica si hay conexión activa a Redis."""
+        """
+        Verifica si hay conexión activa a Redis.
+
+        Un PING exitoso se cachea _OK_CACHE_TTL segundos: las operaciones
+        de caché no pagan un round-trip extra cada una. mark_unhealthy()
+        fuerza un PING real en la próxima verificación.
+        """
         if self._client is None:
             return False
+        if time.monotonic() - self._last_ok_ts < self._OK_CACHE_TTL:
+            return True
         try:
             await self._client.ping()
+            self._last_ok_ts = time.monotonic()
             return True
         except (ConnectionError, TimeoutError):
+            self._last_ok_ts = 0.0
             return False
 
-    async def reconnect(self) -> bool:
-        """Intenta reconectar a Redis."""
+    def mark_unhealthy(self) -> None:
+        """Invalida el estado cacheado tras un error en un comando real."""
+        self._last_ok_ts = 0.0
+
+    async def _disconnect(self) -> None:
+        """Cierra el cliente y las conexiones del pool."""
         if self._client:
             await self._client.close()
+        if self._pool:
+            await self._pool.disconnect()
         self._client = None
+        self._pool = None
+        self._last_ok_ts = 0.0
+
+    async def reconnect(self) -> bool:
+        """Intenta reconectar a Redis."""
+        await self._disconnect()
         self._initialized = False
         await self._connect()
         self._initialized = True
@@ -110,8 +161,7 @@ class RedisClient:
     async def close(self) -> None:
         """Cierra la conexión a Redis."""
         if self._client:
-            await self._client.close()
-            self._client = None
+            await self._disconnect()
             self._initialized = False
 
 
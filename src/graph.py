@@ -44,6 +44,17 @@ _llm_benefits = ChatBedrock(
 
 _graph = None
 
+# Routing del supervisor: tabla y router a nivel de módulo
+_CONDITIONAL_MAP = {"benefits": "benefits", "finish": END}
+
+
+def should_continue(state):
+    return (
+        "finish"
+        if state.get("next", "finish") == "finish"
+        else state["next"]
+    )
+
 
 def get_graph():
     """Retorna el grafo compilado (singleton)."""
@@ -61,18 +72,6 @@ def _build_graph():
     workflow.add_node("supervisor", supervisor)
     workflow.add_node("benefits", benefits)
     workflow.add_edge("benefits", "supervisor")
-
-    def should_continue(state):
-        return (
-            "finish"
-            if state.get("next", "finish") == "finish"
-            else state["next"]
-        )
-
-    workflow.add_conditional_edges(
-        "supervisor",
-        should_continue,
-        {"benefits": "benefits", "finish": END},
-    )
+    workflow.add_conditional_edges("supervisor", should_continue, _CONDITIONAL_MAP)
     workflow.set_entry_point("supervisor")
     return workflow.compile()
@@ -13,10 +13,10 @@ Uso:
     await memory.save_messages("+5491112345678", [HumanMessage(...), AIMessage(...)])
 """
 
-import json
 import os
 from typing import Optional
 
+import orjson
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 
 try:
@@ -90,7 +90,7 @@ class ConversationMemoryService:
             raw = await self._redis.client.get(key)
             if not raw:
                 return []
-            data = json.loads(raw)
+            data = orjson.loads(raw)
             messages = [_deserialize_message(m) for m in data]
             tail = phone_number[-4:]
             print(f"[Memory] Cargados {len(messages)} msgs ({tail})")
@@ -128,12 +128,12 @@ class ConversationMemoryService:
             existing: list[dict] = []
             raw = await self._redis.client.get(key)
             if raw:
-                existing = json.loads(raw)
+                existing = orjson.loads(raw)
 
             combined = (existing + new_serialized)[-self._max_messages:]
             await self._redis.client.setex(
                 key, self._ttl,
-                json.dumps(combined, ensure_ascii=False),
+                orjson.dumps(combined),
             )
             tail = phone_number[-4:]
             print(f"[Memory] Guardados {len(combined)} msgs ({tail})")
@@ -177,7 +177,7 @@ class ConversationMemoryService:
             raw = await self._redis.client.get(key)
             if not raw:
                 return 0
-            return len(json.loads(raw))
+            return len(orjson.loads(raw))
         except Exception:
             return 0
 
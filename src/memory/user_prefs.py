@@ -15,9 +15,10 @@ Estructura del dict:
     }
 """
 
-import json
 from typing import Optional
 
+import orjson
+
 try:
     from ..cache.redis_client import get_redis_client
 except ImportError:
@@ -65,7 +66,7 @@ class UserPrefsService:
             raw = await self._redis.client.get(key)
             if not raw:
                 return {}
-            return json.loads(raw)
+            return orjson.loads(raw)
         except Exception as e:
             print(f"[Prefs] Error al cargar preferencias: {e}")
             return dict(_memory_fallback.get(key, {}))
@@ -79,7 +80,7 @@ class UserPrefsService:
         try:
             await self._redis.client.setex(
                 key, PREFS_TTL,
-                json.dumps(prefs, ensure_ascii=False),
+                orjson.dumps(prefs),
             )
             return True
         except Exception as e:
@@ -18,6 +18,17 @@ Estructura del beneficio en la API:
 import re
 import unicodedata
 
+# Tabla de canonicalización: sin acentos + casefold, vía str.translate (C).
+# Las claves de los dicts están en esta forma canónica, así los lookups no
+# necesitan variantes acentuadas duplicadas.
+_ACCENT_TBL = str.maketrans("áéíóúüÁÉÍÓÚÜ", "aeiouuAEIOUU")
+
+
+def canon(text: str) -> str:
+    """Forma canónica para lookups: sin acentos, casefold, sin bordes."""
+    return text.translate(_ACCENT_TBL).casefold().strip()
+
+
 # ── TRADES ───────────────────────────────────────────────────────────────────
 # Clave normalizada (sin acentos, min.) -> lista de IDs en campo r[]
 # Muchas categorias tienen multiples IDs en la API (duplicados historicos).
@@ -99,15 +110,14 @@ CARD_CATEGORIES: dict[str, list[int]] = {
 # Dia(s) -> int o list[int] (1=lunes ... 7=domingo).
 # Campo "a" del beneficio: "1234567"=todos, "56"=sab+dom.
 # Multi-dia: "fin de semana" -> [6, 7]
+# Claves canónicas (sin acentos): resolve_days canonicaliza la entrada.
 DAYS_OF_THE_WEEK: dict[str, int | list[int]] = {
     "lunes":            1,
     "martes":           2,
     "miercoles":        3,
-    "miércoles":        3,
     "jueves":           4,
     "viernes":          5,
     "sabado":           6,
-    "sábado":           6,
     "domingo":          7,
     # Plurales
     "lunes a viernes":    [1, 2, 3, 4, 5],
@@ -116,7 +126,6 @@ DAYS_OF_THE_WEEK: dict[str, int | list[int]] = {
     "finde":              [6, 7],
     "fin de semanas":     [6, 7],
     "todos los dias":     [1, 2, 3, 4, 5, 6, 7],
-    "todos los días":     [1, 2, 3, 4, 5, 6, 7],
 }
 
 # ── TRADE_ALIASES ────────────────────────────────────────────────────────────
@@ -316,27 +325,40 @@ PRODUCT_NAME_ALIASES: dict[str, str] = {
 }
 
 
+# Lookups precomputados al importar: texto canónico → resultado final.
+# Alias y claves de TRADES resueltos a IDs en un solo dict (un .get por query).
+_TRADE_IDS: dict[str, list[int]] = {
+    **{canon(k): ids for k, ids in TRADES.items()},
+    **{
+        canon(alias): TRADES[key]
+        for alias, key in TRADE_ALIASES.items()
+        if key in TRADES
+    },
+}
+_DAYS: dict[str, list[int]] = {
+    canon(k): (v if isinstance(v, list) else [v])
+    for k, v in DAYS_OF_THE_WEEK.items()
+}
+
+
 def resolve_trade_ids(categoria: str) -> list[int]:
     """
     Resuelve una categoría (texto libre o clave) a su lista de IDs de trade.
 
-    Primero intenta alias, luego búsqueda directa en TRADES.
+    Alias y claves directas de TRADES, con o sin acentos.
     Retorna lista vacía si no encuentra match.
     """
-    key = TRADE_ALIASES.get(categoria.lower(), categoria.lower())
-    return TRADES.get(key, [])
+    return _TRADE_IDS.get(canon(categoria), [])
 
 
 def resolve_days(dia: str) -> list[int]:
     """
     Resuelve un día o expresión multi-día a lista de números (1-7).
 
+    Acepta variantes con o sin acentos ("sábado", "sabado").
     Retorna lista vacía si no reconoce la expresión.
     """
-    val = DAYS_OF_THE_WEEK.get(dia.lower())
-    if val is None:
-        return []
-    return val if isinstance(val, list) else [val]
+    return _DAYS.get(canon(dia), [])
 
 
 def normalize_segment(raw: str) -> str:
@@ -11,7 +11,7 @@ Cambios respecto a la versión anterior:
 
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Entities(BaseModel):
@@ -32,6 +32,10 @@ class Entities(BaseModel):
         provincia: Provincia mencionada explícitamente por el usuario
     """
 
+    # Sin validate_assignment: las entidades se validan una sola vez al
+    # construirse; ningún caller las muta campo a campo.
+    model_config = ConfigDict(extra="forbid", validate_assignment=False)
+
     ciudad:         Optional[str] = None
     tarjeta:        Optional[str] = None
     dias:           Optional[list[str]] = None
@@ -41,7 +45,3 @@ class Entities(BaseModel):
     segmento:       Optional[str] = None
     provincia:      Optional[str] = None
     tipo_beneficio: Optional[str] = None   # "cuotas" | "descuento" | None
-
-    class Config:
-        extra = "forbid"
-        validate_assignment = True
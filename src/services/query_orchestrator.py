@@ -302,9 +302,12 @@ class QueryOrchestrator:
                 )
             classification = await classify_query(query)
 
-        classification_dict = classification.model_dump()
+        # El dict solo lo necesitan el audit y el paso 7 (grafo); sin audit
+        # se difiere para no pagar el model_dump en las salidas tempranas.
+        classification_dict: Optional[dict] = None
 
         if audit_service:
+            classification_dict = classification.model_dump()
             await audit_service.record_user_input(
                 session_id=session_id,
                 model_id=BEDROCK_MODEL_ID,
@@ -380,7 +383,7 @@ class QueryOrchestrator:
                         f"dias={rescued.dias}"
                     )
                     classification = rescued
-                    classification_dict = classification.model_dump()
+                    classification_dict = None
 
         if classification.intent == "unknown":
             if on_unknown_query:
@@ -409,6 +412,9 @@ class QueryOrchestrator:
                 total_ms=total_ms,
             )
 
+        if classification_dict is None:
+            classification_dict = classification.model_dump()
+
         # ── 6. Persistir provincia inline (query mixta beneficio+zona) ───
         if phone and prefs_svc and classification.provincia \
                 and not user_prefs.get("ciudad"):
@@ -17,11 +17,16 @@ Pipeline de filtrado (todo Python, sin LLM):
 import asyncio
 import hashlib
 import json
+import os
 import re
+import time
 import unicodedata
-from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 from langchain_core.tools import tool
 from pydantic import BaseModel
 
@@ -48,6 +53,11 @@ except ImportError:
     from src.models.typed_entities import Entities
 
 
+# Trazas por request (HIT, filtros, priorización): solo con
+# BENEFITS_DEBUG=true. Errores, MISS y SET se loguean siempre.
+_BENEFITS_DEBUG = os.getenv("BENEFITS_DEBUG", "false").lower() == "true"
+
+
 # ── Mapa provincia → state IDs (TeVaBien) ────────────────────────────────
 # Provincias con múltiples IDs (zonas internas) se consultan en paralelo.
 # Si la provincia no figura en el mapa → fallback a consulta global.
@@ -131,7 +141,9 @@ class BenefitsAPIConfig(BaseModel):
 
 class BenefitsResponse(BaseModel):
     success:    bool
-    data:       Optional[List[BenefitItem]] = None
+    # Dicts crudos con la forma de BenefitItem: no se validan uno por uno
+    # (el pipeline filtra ~500 items y solo normaliza los que muestra).
+    data:       Optional[List[dict]] = None
     error:      Optional[str] = None
     url:        str
     status_code: int
@@ -141,6 +153,7 @@ class BenefitsResponse(BaseModel):
 
 CACHE_TTL_ALL_BENEFITS = 86400   # 24 h — beneficios crudos de la API
 CACHE_TTL_SEARCH_RESULTS = 3600  #  1 h — resultados filtrados/ordenados
+CACHE_TTL_LOCAL_BENEFITS = 60    #  1 min — copia en proceso (evita Redis)
 PAGE_SIZE = 5
 
 
@@ -175,6 +188,33 @@ def _build_search_cache_key(
     return f"benefits:search:{h}"
 
 
+# ── Cliente HTTP compartido ──────────────────────────────────────────────
+# Un único AsyncClient por proceso: reutiliza conexiones keep-alive y
+# sesiones TLS contra tevabien.com en vez de un handshake por cache miss.
+
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+_HTTP_CLIENT_LOCK = asyncio.Lock()
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+async def _get_http_client() -> httpx.AsyncClient:
+    """Retorna el cliente HTTP compartido, creándolo la primera vez."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        async with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+                _HTTP_CLIENT = httpx.AsyncClient(limits=_HTTP_LIMITS)
+    return _HTTP_CLIENT
+
+
+async def close_http_client() -> None:
+    """Cierra el cliente HTTP compartido (shutdown de la app)."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
+
 async def _fetch_all_benefits_from_api(
     config: BenefitsAPIConfig,
     headers: Dict[str, str],
@@ -184,7 +224,7 @@ async def _fetch_all_benefits_from_api(
     label = f"state={state_id}" if state_id is not None else "global"
 
     if MOCK_BENEFITS:
-        data = get_mock_benefits(state_id)
+        data = _index_benefits(get_mock_benefits(state_id))
         print(f"[Mock] Beneficios mock ({label}): {len(data)}")
         return data
 
@@ -198,14 +238,15 @@ async def _fetch_all_benefits_from_api(
     else:
         params = {"pagesize": config.default_pagesize, "allFields": ""}
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(
-                config.base_url, params=params, headers=headers
-            )
-            response.raise_for_status()
-            data = response.json()
-            print(f"[API] Beneficios obtenidos ({label}): {len(data)}")
-            return data
+        client = await _get_http_client()
+        response = await client.get(
+            config.base_url, params=params, headers=headers, timeout=timeout
+        )
+        response.raise_for_status()
+        # orjson sobre los bytes crudos: el payload es de ~50-200 KB
+        data = _index_benefits(orjson.loads(response.content))
+        print(f"[API] Beneficios obtenidos ({label}): {len(data)}")
+        return data
     except Exception as e:
         print(f"[API] Error al obtener beneficios: {e}")
         raise
@@ -233,7 +274,8 @@ async def _get_cached_for_state(
         print(f"[Cache] Error leyendo caché: {e}")
 
     if cached_data is not None:
-        print(f"[Cache] HIT: {cache_key}")
+        if _BENEFITS_DEBUG:
+            print(f"[Cache] HIT: {cache_key}")
         return cached_data
 
     print(f"[Cache] MISS: {cache_key} — llamando API...")
@@ -250,11 +292,63 @@ async def _get_cached_for_state(
     return data
 
 
+# Capa en proceso delante de Redis: {state_ids: (expira_monotonic, día UTC,
+# beneficios)}. Guarda el resultado ya mergeado (multi-zona incluido).
+_LOCAL_BENEFITS: Dict[Tuple[int, ...], Tuple[float, str, List[dict]]] = {}
+# Carga en curso por clave: los requests concurrentes esperan la misma
+# en vez de ir todos a Redis/API a la vez.
+_LOCAL_INFLIGHT: Dict[Tuple[int, ...], "asyncio.Task"] = {}
+
+
+def _forget_inflight(key: Tuple[int, ...], task: "asyncio.Task") -> None:
+    if _LOCAL_INFLIGHT.get(key) is task:
+        del _LOCAL_INFLIGHT[key]
+
+
 async def _get_all_benefits_cached(
     config: BenefitsAPIConfig,
     headers: Dict[str, str],
     timeout: int = 10,
     state_ids: Optional[List[int]] = None,
+) -> Optional[List[dict]]:
+    """
+    Igual que _load_all_benefits, con una copia en memoria de hasta
+    CACHE_TTL_LOCAL_BENEFITS segundos (invalidada al cambiar el día UTC).
+    """
+    if not CACHE_ENABLED:
+        return await _load_all_benefits(config, headers, timeout, state_ids)
+
+    key = tuple(state_ids or ())
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    entry = _LOCAL_BENEFITS.get(key)
+    if entry is not None:
+        expires, day, data = entry
+        if time.monotonic() < expires and day == today:
+            return data
+        del _LOCAL_BENEFITS[key]
+
+    loop = asyncio.get_running_loop()
+    task = _LOCAL_INFLIGHT.get(key)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(
+            _load_all_benefits(config, headers, timeout, state_ids)
+        )
+        _LOCAL_INFLIGHT[key] = task
+        task.add_done_callback(partial(_forget_inflight, key))
+
+    data = await asyncio.shield(task)
+    if data:
+        _LOCAL_BENEFITS[key] = (
+            time.monotonic() + CACHE_TTL_LOCAL_BENEFITS, today, data
+        )
+    return data
+
+
+async def _load_all_benefits(
+    config: BenefitsAPIConfig,
+    headers: Dict[str, str],
+    timeout: int = 10,
+    state_ids: Optional[List[int]] = None,
 ) -> Optional[List[dict]]:
     """
     Obtiene beneficios cacheados por provincia (state_ids) o globales.
@@ -294,15 +388,90 @@ async def _get_all_benefits_cached(
                     seen.add(bid)
                     merged.append(item)
 
-    print(
-        f"[Cache] Merge {len(state_ids)} zonas -> "
-        f"{len(merged)} beneficios unicos"
-    )
+    if _BENEFITS_DEBUG:
+        print(
+            f"[Cache] Merge {len(state_ids)} zonas -> "
+            f"{len(merged)} beneficios unicos"
+        )
     return merged or None
 
 
 # ── Filtrado (lógica pura, sin LLM) ──────────────────────────────────────────
 
+# Campos derivados que se precalculan al traer el dataset (y viajan con él
+# al caché de 24h), para no repetir .lower()/str() en cada request:
+#   _bl → nombre del comercio en minúsculas
+#   _dm → días válidos como bitmask (bit N = día N)
+_NAME_LOWER = "_bl"
+_DAY_MASK = "_dm"
+
+
+def _day_mask(days) -> int:
+    """Convierte días ("1234567" o [1, 5]) a bitmask; ignora no-dígitos."""
+    mask = 0
+    for d in str(days) if isinstance(days, (str, int)) else days:
+        d = str(d)
+        if d.isdigit():
+            mask |= 1 << int(d)
+    return mask
+
+
+# Campos que normalize_promo indexa directo (promo["x"]): sin validar cada
+# item con BenefitItem, un item roto de la API tiraría KeyError afuera del
+# try de fetch_benefits. b/a/ct además tienen que ser str.
+_REQUIRED_KEYS = ("t", "d", "q")
+_REQUIRED_STR_KEYS = ("a", "b", "ct")
+
+
+def _is_valid_item(item) -> bool:
+    """Chequeo de forma barato (reemplaza la validación por BenefitItem)."""
+    return (
+        isinstance(item, dict)
+        and all(k in item for k in _REQUIRED_KEYS)
+        and all(isinstance(item.get(k), str) for k in _REQUIRED_STR_KEYS)
+    )
+
+
+def _index_benefits(data: Optional[List[dict]]) -> Optional[List[dict]]:
+    """
+    Descarta los items mal formados y agrega los campos derivados de
+    filtrado a los válidos (in place).
+
+    Raises:
+        ValueError: si la API no devolvió una lista (fetch_benefits lo
+                    convierte en success=False).
+    """
+    if data is None:
+        return None
+    if not isinstance(data, list):
+        raise ValueError(
+            f"Respuesta inesperada de la API: {type(data).__name__}"
+        )
+    indexed: List[dict] = []
+    for item in data:
+        if not _is_valid_item(item):
+            continue
+        item[_NAME_LOWER] = item["b"].lower()
+        item[_DAY_MASK] = _day_mask(item["a"])
+        indexed.append(item)
+    if len(indexed) != len(data):
+        print(
+            f"[API] {len(data) - len(indexed)} beneficios mal formados "
+            "descartados"
+        )
+    return indexed
+
+
+def _item_name_lower(item: dict) -> str:
+    name = item.get(_NAME_LOWER)
+    return name if name is not None else item.get("b", "").lower()
+
+
+def _item_day_mask(item: dict) -> int:
+    mask = item.get(_DAY_MASK)
+    return mask if mask is not None else _day_mask(item.get("a", ""))
+
+
 def _apply_filters(data: List[dict], params: dict) -> List[dict]:
     """
     Aplica todos los filtros determinísticos sobre la lista completa.
@@ -310,84 +479,59 @@ def _apply_filters(data: List[dict], params: dict) -> List[dict]:
     Cada filtro es inclusivo: si el parámetro no está presente,
     no se filtra por ese criterio (devuelve todos).
 
+    Todos los criterios se evalúan en una sola pasada sobre los datos
+    (sin listas intermedias por filtro).
+
     Campos del beneficio usados:
       r[]  → trade IDs (categoría de rubro)
-      a    → string de días "1234567"
-      b    → nombre del comercio
-      pr[] → product IDs requeridos (vacío = todos)
+      a    → string de días "1234567" (vía bitmask _dm)
+      b    → nombre del comercio (vía _bl, en minúsculas)
+      o[]  → product IDs requeridos (vacío = todos)
+      t    → tipo (406=cuotas, 407=descuento, 409=ambos)
     """
-    filtered = data
-
-    # 1. Categoría: ANY(trade_id in item["r"])
-    trade_ids = params.get("trade_ids", [])
-    if trade_ids:
-        trade_set = set(trade_ids)
-        filtered = [
-            item for item in filtered
-            if trade_set & set(item.get("r", []))
-        ]
-        print(
-            f"[Filter] trade_ids={trade_ids} -> {len(filtered)} beneficios"
-        )
-
-    # 2. Días: ANY(str(day) in item["a"])
-    days = params.get("days", [])
-    if days:
-        day_strs = {str(d) for d in days}
-        filtered = [
-            item for item in filtered
-            if any(d in str(item.get("a", "")) for d in day_strs)
-        ]
-        print(f"[Filter] days={days} -> {len(filtered)} beneficios")
-
-    # 3. Negocio: substring case-insensitive en nombre del comercio
+    # Parámetros resueltos una sola vez, fuera del loop
+    trade_set = set(params.get("trade_ids") or ()) or None
+    days = params.get("days")
+    day_bits = _day_mask(days) if days else 0
     negocio = params.get("negocio")
-    if negocio:
-        filtered = [
-            item for item in filtered
-            if negocio.lower() in item.get("b", "").lower()
-        ]
-        print(
-            f"[Filter] negocio='{negocio}' -> {len(filtered)} beneficios"
-        )
+    negocio_l = negocio.lower() if negocio else None
+    product_set = set(params.get("product_ids") or ()) or None
+    benefit_type = params.get("benefit_type")
+    # t=406 cuotas, t=407 descuento, t=409 ambos
+    types = {"cuotas": (406, 409), "descuento": (407, 409)}.get(benefit_type)
 
-    # 4. Productos del usuario: o[] vacío (universal) o intersección
-    product_ids = params.get("product_ids", [])
-    if product_ids:
-        pset = set(product_ids)
-        filtered = [
-            item for item in filtered
-            if not item.get("o")               # o[] vacío = para todos
-            or bool(pset & set(item.get("o", [])))
-        ]
-        print(
-            f"[Filter] product_ids={product_ids} -> {len(filtered)} "
-            "beneficios"
-        )
+    if not (trade_set or day_bits or negocio_l or product_set or types):
+        return data
 
-    # 5. Tipo de beneficio: t=406 cuotas, t=407 descuento, t=409 ambos
-    benefit_type = params.get("benefit_type")
-    if benefit_type == "cuotas":
-        before = len(filtered)
-        filtered = [
-            item for item in filtered
-            if item.get("t") in (406, 409)
-        ]
-        print(
-            f"[Filter] benefit_type=cuotas -> {len(filtered)} "
-            f"(de {before})"
-        )
-    elif benefit_type == "descuento":
-        before = len(filtered)
-        filtered = [
-            item for item in filtered
-            if item.get("t") in (407, 409)
-        ]
+    filtered: List[dict] = []
+    for item in data:
+        # 1. Categoría: ANY(trade_id in item["r"])
+        if trade_set and trade_set.isdisjoint(item.get("r", ())):
+            continue
+        # 2. Días: ANY(day in item["a"])
+        if day_bits and not (_item_day_mask(item) & day_bits):
+            continue
+        # 3. Negocio: substring case-insensitive en nombre del comercio
+        if negocio_l and negocio_l not in _item_name_lower(item):
+            continue
+        # 4. Productos del usuario: o[] vacío (universal) o intersección
+        if product_set:
+            required = item.get("o")
+            if required and product_set.isdisjoint(required):
+                continue
+        # 5. Tipo de beneficio
+        if types and item.get("t") not in types:
+            continue
+        filtered.append(item)
+
+    if _BENEFITS_DEBUG:
         print(
-            f"[Filter] benefit_type=descuento -> {len(filtered)} "
-            f"(de {before})"
+            f"[Filter] trade_ids={params.get('trade_ids') or '-'} "
+            f"days={days or '-'} negocio={negocio or '-'} "
+            f"product_ids={params.get('product_ids') or '-'} "
+            f"benefit_type={benefit_type or '-'} "
+            f"-> {len(filtered)} de {len(data)} beneficios"
         )
-
     return filtered
 
 
@@ -447,16 +591,18 @@ def _prioritize(data: List[dict], params: dict) -> List[dict]:
     ]
 
     if params.get("is_exclusive_query") and exclusive:
-        print(
-            f"[Prioritize] Modo exclusivo: {len(exclusive)} beneficios "
-            "del segmento"
-        )
+        if _BENEFITS_DEBUG:
+            print(
+                f"[Prioritize] Modo exclusivo: {len(exclusive)} beneficios "
+                "del segmento"
+            )
         return exclusive
 
-    print(
-        f"[Prioritize] {len(exclusive)} exclusivos + "
-        f"{len(general)} generales"
-    )
+    if _BENEFITS_DEBUG:
+        print(
+            f"[Prioritize] {len(exclusive)} exclusivos + "
+            f"{len(general)} generales"
+        )
     return exclusive + general
 
 
@@ -500,12 +646,13 @@ async def fetch_benefits(
 
     # Construir parámetros de filtro (toda la lógica de negocio aquí)
     filter_params = build_filter_params(entities, user_profile)
-    print(f"[Benefits] filter_params={filter_params}")
+    if _BENEFITS_DEBUG:
+        print(f"[Benefits] filter_params={filter_params}")
 
     # Resolver state IDs a partir de la provincia del perfil
     provincia = (user_profile or {}).get("provincia")
     state_ids = _resolve_state_ids(provincia)
-    if provincia:
+    if provincia and _BENEFITS_DEBUG:
         label = (
             f"{provincia} → state_ids={state_ids}"
             if state_ids
@@ -531,11 +678,12 @@ async def fetch_benefits(
         prioritized = _prioritize(filtered, filter_params)
         sorted_data = _sort_by_discount(prioritized)
 
-        print(
-            f"[Benefits] {len(all_benefits)} total -> "
-            f"{len(filtered)} filtrados -> "
-            f"{len(sorted_data)} ordenados"
-        )
+        if _BENEFITS_DEBUG:
+            print(
+                f"[Benefits] {len(all_benefits)} total -> "
+                f"{len(filtered)} filtrados -> "
+                f"{len(sorted_data)} ordenados"
+            )
 
         return BenefitsResponse(
             success=True,
@@ -589,7 +737,7 @@ async def search_benefits(
 
     # Serializar top 10 al LLM (reducir tokens)
     top = (response.data or [])[:5]
-    datas_json = [normalize_promo(b.model_dump()) for b in top]
+    datas_json = [normalize_promo(b) for b in top]
 
     result: dict = {"data": datas_json}
     if response.error:
@@ -645,10 +793,11 @@ async def search_benefits_with_profile(
             cache = await get_cache_service()
             cached = await cache.get(cache_key)
             if cached is not None:
-                print(
-                    f"[Cache] HIT search: {cache_key[-12:]} "
-                    f"({len(cached)} items)"
-                )
+                if _BENEFITS_DEBUG:
+                    print(
+                        f"[Cache] HIT search: {cache_key[-12:]} "
+                        f"({len(cached)} items)"
+                    )
                 all_normalized = cached
         except Exception as ce:
             print(f"[Cache] Error leyendo search cache: {ce}")
@@ -661,9 +810,7 @@ async def search_benefits_with_profile(
         all_data = response.data or []
         # Normalizar TODOS los items (no solo el top-5)
         # para poder paginar correctamente desde el caché.
-        all_normalized = [
-            normalize_promo(b.model_dump()) for b in all_data
-        ]
+        all_normalized = [normalize_promo(b) for b in all_data]
         api_error = response.error
 
         if CACHE_ENABLED and all_normalized:
@@ -13,14 +13,15 @@ Ventajas sobre S3:
 """
 
 import asyncio
-import json
-import time
+import collections
+import threading
 import uuid
 from datetime import datetime, timezone
 from functools import partial
 from typing import Any, Optional
 
 import boto3
+import orjson
 from pydantic import BaseModel
 
 try:
@@ -40,6 +41,14 @@ except ImportError:
     )
 
 
+# Límites de put_log_events: 10 000 eventos y 1 MB por llamada (cada
+# evento suma 26 bytes de overhead); se deja margen en bytes.
+_BATCH_MAX = 10_000
+_BATCH_MAX_BYTES = 900_000
+_LOG_EVENT_OVERHEAD = 26
+_DRAIN_JOIN_TIMEOUT = 10
+
+
 class UnhandledQuery(BaseModel):
     """Modelo para queries no identificadas."""
     id: str
@@ -59,6 +68,17 @@ class CloudWatchUnhandledService:
         self._client: Any = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
+        # Eventos pendientes: (timestamp_ms, message). save_unhandled_query
+        # solo encola; un thread dedicado los escribe en lotes.
+        self._queue: collections.deque = collections.deque()
+        self._wake = threading.Event()
+        self._closing = False
+        self._drainer: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._group_ready = False
+        self._ready_streams: set[str] = set()
+
     def _get_client(self) -> Any:
         if self._client is None:
             self._client = boto3.client("logs", region_name=AWS_REGION)
@@ -93,17 +113,89 @@ class CloudWatchUnhandledService:
         except client.exceptions.ResourceAlreadyExistsException:
             pass
 
-    def _put_event(self, message: str) -> None:
+    def _put_events(self, events: list[tuple[int, str]]) -> None:
+        """Un put_log_events al stream diario (group/stream creados una vez)."""
         stream = self._daily_stream()
-        self._ensure_log_group()
-        self._ensure_log_stream(stream)
-        ts_ms = int(time.time() * 1000)
+        if not self._group_ready:
+            self._ensure_log_group()
+            self._group_ready = True
+        if stream not in self._ready_streams:
+            self._ensure_log_stream(stream)
+            self._ready_streams.add(stream)
         self._get_client().put_log_events(
             logGroupName=CW_LOG_GROUP_UNHANDLED,
             logStreamName=stream,
-            logEvents=[{"timestamp": ts_ms, "message": message}],
+            logEvents=[
+                {"timestamp": ts_ms, "message": message}
+                for ts_ms, message in events
+            ],
         )
 
+    # ------------------------------------------------------------------
+    # Drenado en background
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, message: str, ts_ms: int) -> None:
+        if self._drainer is None:
+            with self._start_lock:
+                if self._drainer is None:
+                    self._closing = False
+                    self._drainer = threading.Thread(
+                        target=self._drain_loop,
+                        name="cw-unhandled-drain",
+                        daemon=True,
+                    )
+                    self._drainer.start()
+        self._queue.append((ts_ms, message))
+        self._wake.set()
+
+    def _drain_loop(self) -> None:
+        """Thread dedicado: drena la cola hasta close()."""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            self._drain_pending()
+            if self._closing:
+                return
+
+    def _drain_pending(self) -> None:
+        """Escribe todo lo encolado en lotes dentro de los límites de CW."""
+        with self._drain_lock:
+            while self._queue:
+                batch = self._take_batch()
+                try:
+                    self._put_events(batch)
+                    print(
+                        f"[CW] {len(batch)} unhandled queries guardadas: "
+                        f"{CW_LOG_GROUP_UNHANDLED}/{self._daily_stream()}"
+                    )
+                except Exception as e:
+                    print(
+                        f"[CW] Error guardando {len(batch)} unhandled "
+                        f"queries: {e}"
+                    )
+
+    def _take_batch(self) -> list[tuple[int, str]]:
+        batch: list[tuple[int, str]] = []
+        size = 0
+        while self._queue and len(batch) < _BATCH_MAX:
+            ts_ms, message = self._queue[0]
+            item_size = len(message.encode()) + _LOG_EVENT_OVERHEAD
+            if batch and size + item_size > _BATCH_MAX_BYTES:
+                break
+            self._queue.popleft()
+            batch.append((ts_ms, message))
+            size += item_size
+        return batch
+
+    async def close(self) -> None:
+        """Drena los eventos pendientes y detiene el thread de escritura."""
+        if self._drainer is not None:
+            self._closing = True
+            self._wake.set()
+            await self._run(self._drainer.join, _DRAIN_JOIN_TIMEOUT)
+            self._drainer = None
+
     async def save_unhandled_query(
         self,
         query: str,
@@ -115,12 +207,16 @@ class CloudWatchUnhandledService:
     ) -> dict:
         """
         Guarda una query no identificada en CloudWatch Logs.
+        La escritura es en background y en lotes: success=True indica
+        que el evento quedó encolado.
 
         Returns:
             dict con id, log_group y success status
         """
         query_id = str(uuid.uuid4())
-        timestamp = datetime.now(timezone.utc).isoformat()
+        # Un solo reloj para el record y el timestamp del evento de CW
+        now = datetime.now(timezone.utc)
+        timestamp = now.isoformat()
 
         record = UnhandledQuery(
             id=query_id,
@@ -136,11 +232,8 @@ class CloudWatchUnhandledService:
         message = record.model_dump_json()
 
         try:
-            await self._run(self._put_event, message)
-            print(
-                f"[CW] Unhandled query guardada: "
-                f"{CW_LOG_GROUP_UNHANDLED}/{self._daily_stream()}"
-            )
+            # Solo encola: el put_log_events lo hace el thread de drenado
+            self._enqueue(message, int(now.timestamp() * 1000))
             return {
                 "success": True,
                 "id": query_id,
@@ -198,4 +291,4 @@ async def save_unhandled_query_tool(
         entities=entities,
         reason=reason,
     )
-    return json.dumps(result)
+    return orjson.dumps(result).decode()
@@ -222,10 +222,27 @@ _KNOWN_NEGOCIOS: dict[str, str] = {
     "disco": "disco",
 }
 
-_NEGOCIO_PATTERNS: list[tuple[re.Pattern, str]] = [
-    (re.compile(r"\b" + re.escape(key) + r"\b"), name)
-    for key, name in _KNOWN_NEGOCIOS.items()
-]
+# Un único regex con todas las claves (más largas primero) en vez de un
+# search por negocio. La prioridad entre varios matches sigue siendo el
+# orden de _KNOWN_NEGOCIOS.
+_NEGOCIO_PRIORITY: dict[str, int] = {
+    key: i for i, key in enumerate(_KNOWN_NEGOCIOS)
+}
+_NEGOCIO_RE = re.compile(
+    r"\b(?:"
+    + "|".join(
+        re.escape(key) for key in sorted(_KNOWN_NEGOCIOS, key=len, reverse=True)
+    )
+    + r")\b"
+)
+
+
+def _match_negocio(text: str) -> Optional[str]:
+    """Negocio conocido mencionado en el texto normalizado (o None)."""
+    keys = _NEGOCIO_RE.findall(text)
+    if not keys:
+        return None
+    return _KNOWN_NEGOCIOS[min(keys, key=_NEGOCIO_PRIORITY.__getitem__)]
 
 # Lista ordenada: frases más específicas primero para evitar match parcial
 _WEEKDAYS = ["lunes", "martes", "miercoles", "jueves", "viernes"]
@@ -282,6 +299,17 @@ _LOCATION_PREFIXES = (
 
 # ── Matching de categoría ────────────────────────────────────────────────
 
+# Keywords separadas una sola vez al importar: (categoría, simples, frases)
+_CATEGORY_INDEX: list[tuple[str, frozenset[str], tuple[str, ...]]] = [
+    (
+        cat,
+        frozenset(kw for kw in keywords if " " not in kw),
+        tuple(kw for kw in keywords if " " in kw),
+    )
+    for cat, keywords in _CATEGORY_KEYWORDS.items()
+]
+
+
 def _match_category(text: str, tokens: set[str]) -> Optional[str]:
     """
     Busca la categoría de comercio en el texto normalizado.
@@ -304,16 +332,13 @@ def _match_category(text: str, tokens: set[str]) -> Optional[str]:
         for t in tokens
     }
 
-    for cat, keywords in _CATEGORY_KEYWORDS.items():
+    for cat, single, multi in _CATEGORY_INDEX:
         # 1. Nombre canónico (singular o plural simple: cat + 's')
         if cat in tokens or cat in singular_tokens:
             return cat
 
-        multi = {kw for kw in keywords if " " in kw}
-        single = keywords - multi
-
         # 2 + 3. Keyword exacta o singularizada
-        if single & tokens or single & singular_tokens:
+        if not (single.isdisjoint(tokens) and single.isdisjoint(singular_tokens)):
             return cat
 
         # 4. Frases multi-palabra (substring)
@@ -332,6 +357,11 @@ def fast_classify(query: str) -> Optional[Classification]:
     Retorna Classification si puede determinarlo con confianza.
     Retorna None si la consulta es ambigua → usar classify_query (LLM).
     """
+    # Sin letras ("???", "123") no hay keyword posible: ni normalizar.
+    # El caller la rechaza después con is_valid_query.
+    if not any(c.isalpha() for c in query):
+        return None
+
     text = _normalize(query)
     tokens = set(text.split())
 
@@ -382,11 +412,7 @@ def fast_classify(query: str) -> Optional[Classification]:
     dias = _detect_days(text)
 
     # ── Negocio ───────────────────────────────────────────────────────
-    negocio: Optional[str] = None
-    for pattern, nombre in _NEGOCIO_PATTERNS:
-        if pattern.search(text):
-            negocio = nombre
-            break
+    negocio = _match_negocio(text)
 
     # ── Categoría ─────────────────────────────────────────────────────
     categoria = _match_category(text, tokens)
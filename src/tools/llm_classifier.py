@@ -16,7 +16,10 @@ Retorna:
 
 from __future__ import annotations
 
+import hashlib
 import json
+import time
+from collections import OrderedDict
 from typing import Literal, Optional
 
 from langchain_aws import ChatBedrock
@@ -24,9 +27,11 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from pydantic import BaseModel
 
 try:
-    from ..config import AWS_REGION, BEDROCK_MODEL_ID
+    from ..cache import get_cache_service
+    from ..config import AWS_REGION, BEDROCK_MODEL_ID, CACHE_ENABLED
 except ImportError:
-    from src.config import AWS_REGION, BEDROCK_MODEL_ID
+    from src.cache import get_cache_service
+    from src.config import AWS_REGION, BEDROCK_MODEL_ID, CACHE_ENABLED
 
 # Singleton — una sola instancia para toda la vida del proceso
 _llm = ChatBedrock(model_id=BEDROCK_MODEL_ID, region_name=AWS_REGION)
@@ -157,13 +162,55 @@ class Classification(BaseModel):
             object.__setattr__(self, "dias", [self.dia])
 
 
+# ── Memo de clasificaciones ──────────────────────────────────────────────
+# Las mismas consultas ("descuentos en supermercados") se repiten mucho:
+# se memoiza el resultado por texto normalizado, primero en proceso (LRU)
+# y luego en Redis para compartirlo entre workers.
+
+_MEMO_TTL = 300           # 5 min
+_MEMO_MAX_ENTRIES = 2048
+_MEMO_KEY_PREFIX = "classify:"
+_memo: OrderedDict[str, tuple[float, Classification]] = OrderedDict()
+
+
+def _memo_key(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _memo_get(key: str) -> Optional[Classification]:
+    entry = _memo.get(key)
+    if entry is None:
+        return None
+    expires, value = entry
+    if time.monotonic() > expires:
+        del _memo[key]
+        return None
+    _memo.move_to_end(key)
+    return value
+
+
+def _memo_put(key: str, value: Classification) -> None:
+    # Copia propia: el llamador recibe value y puede mutarlo (p.ej. dias)
+    _memo[key] = (time.monotonic() + _MEMO_TTL, value.model_copy(deep=True))
+    _memo.move_to_end(key)
+    if len(_memo) > _MEMO_MAX_ENTRIES:
+        _memo.popitem(last=False)
+
+
+def _redis_key(key: str) -> str:
+    return _MEMO_KEY_PREFIX + hashlib.blake2b(
+        key.encode(), digest_size=16
+    ).hexdigest()
+
+
 # ── Clasificador ──────────────────────────────────────────────────────────
 
 async def classify_query(query: str) -> Classification:
     """
     Clasifica la consulta del usuario y extrae entidades.
 
-    Fallback del fast_classify. Consume tokens de Bedrock.
+    Fallback del fast_classify. Consume tokens de Bedrock, por lo que
+    el resultado se memoiza 5 min por consulta normalizada.
 
     Args:
         query: Texto del usuario.
@@ -171,6 +218,40 @@ async def classify_query(query: str) -> Classification:
     Returns:
         Classification con intent y entidades relevantes.
     """
+    key = _memo_key(query)
+    hit = _memo_get(key)
+    if hit is not None:
+        return hit.model_copy(deep=True)
+
+    if CACHE_ENABLED:
+        try:
+            cache = await get_cache_service()
+            cached = await cache.get(_redis_key(key))
+            if cached is not None:
+                result = Classification(**cached)
+                _memo_put(key, result)
+                return result
+        except Exception as exc:
+            print(f"[LLMClassifier] Error leyendo caché: {exc}")
+
+    result = await _classify_with_llm(query)
+    if result is None:
+        return Classification(intent="unknown")
+
+    _memo_put(key, result)
+    if CACHE_ENABLED:
+        try:
+            cache = await get_cache_service()
+            await cache.set(
+                _redis_key(key), result.model_dump(), ttl=_MEMO_TTL
+            )
+        except Exception as exc:
+            print(f"[LLMClassifier] Error guardando caché: {exc}")
+    return result
+
+
+async def _classify_with_llm(query: str) -> Optional[Classification]:
+    """Llamada a Bedrock. Retorna None si la respuesta no se pudo parsear."""
     messages = [
         SystemMessage(content=_SYSTEM_PROMPT),
         HumanMessage(content=f"Consulta: {query}"),
@@ -189,4 +270,4 @@ async def classify_query(query: str) -> Classification:
         return Classification(**data)
     except Exception as exc:
         print(f"[LLMClassifier] Error parseando respuesta: {exc}")
-        return Classification(intent="unknown")
+        return None
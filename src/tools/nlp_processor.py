@@ -1,18 +1,23 @@
 """
-NLP Processor — Validación básica de consultas con spaCy.
+NLP Processor — Validación básica de consultas.
 
 Responsabilidad reducida: detectar texto sin sentido (gibberish)
 antes de enviarlo al LLM classifier.
 
 La clasificación de intención y extracción de entidades fue
 migrada a src/tools/llm_classifier.py.
+
+La validación solo necesita saber si hay alguna palabra alfabética de
+3+ letras, así que se resuelve partiendo por espacios en vez de
+cargar un modelo spaCy (~40 MB y ~500 ms de arranque por worker).
 """
 
 import re
+import string
 
-import spacy
-
-nlp = spacy.load("es_core_news_sm")
+# Puntuación que se separa de los extremos de cada palabra (como hace el
+# tokenizer de spaCy); la puntuación interna ("e-mail") se conserva.
+_EDGE_PUNCT = string.punctuation + "¿¡«»“”‘’…"
 
 # Palabras vacías que por sí solas no constituyen una consulta válida
 _STOP_ONLY = {"hola", "ok", "si", "no", "ola", "hey", "hi", "bye"}
@@ -50,10 +55,9 @@ def is_valid_query(text: str) -> bool:
     if len(tokens_alpha) == 1 and tokens_alpha[0] in _STOP_ONLY:
         return False
 
-    # spaCy: necesita al menos un token con 3+ caracteres alfabéticos
-    doc = nlp(stripped)
-    meaningful = [
-        tok for tok in doc
-        if tok.is_alpha and len(tok.text) >= 3 and not tok.is_space
-    ]
-    return len(meaningful) >= 1
+    # Necesita al menos un token con 3+ caracteres alfabéticos
+    for word in stripped.split():
+        tok = word.strip(_EDGE_PUNCT)
+        if len(tok) >= 3 and tok.isalpha():
+            return True
+    return False
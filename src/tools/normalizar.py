@@ -1,4 +1,5 @@
 from datetime import datetime
+from functools import lru_cache
 
 DAYS_MAP = {
     "1": "Lunes",
@@ -13,10 +14,15 @@ DAYS_MAP = {
 BENEFIT_TYPE = {406: "cuotas", 407: "descuento", 409: "descuento_y_cuotas"}
 
 
+# Los valores posibles son pocos (fechas del catálogo y subconjuntos de
+# "1234567"), así que se memoizan: normalize_promo corre por cada beneficio.
+
+@lru_cache(maxsize=1024)
 def parse_date(date_int: int) -> str:
     return datetime.strptime(str(date_int), "%y%m%d").strftime("%d/%m/%Y")
 
 
+@lru_cache(maxsize=256)
 def parse_days(raw: str) -> str:
     if raw == "1234567":
         return "Todos los días"
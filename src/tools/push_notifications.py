@@ -1,6 +1,47 @@
 import asyncio
+import os
+from typing import Optional
 
 import httpx
+import orjson
+
+_WEBHOOK_URL = "https://webhook.site/0cf8618c-41ad-4eff-8a8d-e75c25c7bc0c"
+# El body se serializa con orjson y se envía como bytes: httpx no pasa
+# por su json.dumps ni infiere el Content-Type en cada llamada.
+_HEADERS = {"Content-Type": "application/json"}
+
+# Cliente compartido: el webhook es siempre el mismo host, así que las
+# notificaciones reutilizan una conexión keep-alive en vez de un
+# handshake TCP+TLS por llamada.
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+
+# Tope de POSTs en vuelo: ante una ráfaga de queries no identificadas los
+# envíos esperan turno en vez de agotar el pool (PoolTimeout a los 10 s).
+_PUSH_MAX_CONCURRENCY = int(os.getenv("PUSH_MAX_CONCURRENCY", "64"))
+_push_sem = asyncio.Semaphore(_PUSH_MAX_CONCURRENCY)
+
+
+async def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        async with _client_lock:
+            if _client is None or _client.is_closed:
+                _client = httpx.AsyncClient(
+                    timeout=httpx.Timeout(10.0, read=20.0),
+                    limits=httpx.Limits(
+                        max_connections=100, max_keepalive_connections=20
+                    ),
+                )
+    return _client
+
+
+async def close_push_client() -> None:
+    """Cierra el cliente HTTP compartido (shutdown de la app)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 async def send_push_notification(message: str) -> dict:
@@ -15,16 +56,18 @@ async def send_push_notification(message: str) -> dict:
     """
 
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, read=20.0)) as client:
+        client = await _get_client()
+        async with _push_sem:
             response = await client.post(
-                "https://webhook.site/0cf8618c-41ad-4eff-8a8d-e75c25c7bc0c",
-                json={"message": message},
+                _WEBHOOK_URL,
+                content=orjson.dumps({"message": message}),
+                headers=_HEADERS,
             )
-            response.raise_for_status()
-            try:
-                return response.json()
-            except httpx.HTTPError as e:
-                return {"error": f"Error parsing JSON response: {str(e)}"}
+        response.raise_for_status()
+        try:
+            return response.json()
+        except httpx.HTTPError as e:
+            return {"error": f"Error parsing JSON response: {str(e)}"}
     except httpx.HTTPError as e:
         return {"error": f"HTTP error occurred: {str(e)}"}
     except Exception as e:
@@ -7,6 +7,7 @@ garantizar comportamiento idéntico en ambos canales.
 
 from __future__ import annotations
 
+import asyncio
 from typing import Optional, Tuple
 
 from .nlp_processor import is_valid_query
@@ -28,6 +29,62 @@ _UNKNOWN_RESPONSE = (
 )
 
 
+async def _save_unhandled_safe(query: str) -> None:
+    try:
+        from .cloudwatch_unhandled_queries import get_cw_service
+        cw = await get_cw_service()
+        await cw.save_unhandled_query(
+            query=query,
+            detected_intent="unknown",
+            entities={},
+            reason="unknown_intent",
+        )
+    except Exception as err:
+        print(f"[CW] Error guardando query: {err}")
+
+
+async def _push_safe(message: str) -> None:
+    try:
+        from .push_notifications import send_push_notification
+        await send_push_notification(message)
+    except Exception as err:
+        print(f"[Push] Error: {err}")
+
+
+# Referencias a los envíos en background (evita que el GC los cancele)
+_pending_reports: set[asyncio.Task] = set()
+
+
+async def _send_unknown_report(query: str) -> None:
+    # Ambos envíos en paralelo; cada uno maneja sus propios errores
+    await asyncio.gather(
+        _save_unhandled_safe(query),
+        _push_safe(f"Query no identificada: {query}"),
+    )
+
+
+async def report_unknown_query(query: str) -> None:
+    """
+    Registra una query no identificada (CloudWatch) y avisa por push.
+    Es telemetría: se dispara en background y retorna de inmediato,
+    sin sumar latencia a la respuesta. Nunca propaga excepciones.
+    """
+    task = asyncio.get_running_loop().create_task(
+        _send_unknown_report(query)
+    )
+    _pending_reports.add(task)
+    task.add_done_callback(_pending_reports.discard)
+
+
+async def drain_unknown_reports() -> None:
+    """
+    Espera los reportes en background todavía en vuelo (shutdown de la
+    app). Llamar antes de cerrar el cliente push y el servicio CloudWatch.
+    """
+    if _pending_reports:
+        await asyncio.gather(*_pending_reports, return_exceptions=True)
+
+
 async def classify_and_validate(
     query: str,
 ) -> Tuple[Optional[dict], Optional[str]]:
@@ -49,24 +106,7 @@ async def classify_and_validate(
         classification = await classify_query(query)
 
     if classification.intent == "unknown":
-        try:
-            from .cloudwatch_unhandled_queries import get_cw_service
-            cw = await get_cw_service()
-            await cw.save_unhandled_query(
-                query=query,
-                detected_intent="unknown",
-                entities={},
-                reason="unknown_intent",
-            )
-        except Exception as err:
-            print(f"[CW] Error guardando query: {err}")
-
-        try:
-            from .push_notifications import send_push_notification
-            await send_push_notification(f"Query no identificada: {query}")
-        except Exception as err:
-            print(f"[Push] Error: {err}")
-
+        await report_unknown_query(query)
         return None, _UNKNOWN_RESPONSE
 
     return classification.model_dump(), None
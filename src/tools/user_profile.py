@@ -23,7 +23,6 @@ Clave Redis: comafi:user_profile:{phone_number}
 TTL: 1800 segundos (30 minutos)
 """
 
-import json
 import os
 from typing import Optional
 
@@ -280,9 +279,8 @@ async def fetch_user_profile(phone_number: str) -> UserProfile:
         if await redis.is_connected():
             raw = await redis.client.get(cache_key)
             if raw:
-                cached = json.loads(raw)
                 print(f"[UserProfile] Cache HIT para {normalized[-4:]}")
-                return UserProfile(**cached)
+                return UserProfile.model_validate_json(raw)
     except Exception as e:
         print(f"[UserProfile] Error leyendo caché: {e}")
 
@@ -306,7 +304,7 @@ async def fetch_user_profile(phone_number: str) -> UserProfile:
             await redis.client.setex(
                 cache_key,
                 USER_PROFILE_CACHE_TTL,
-                json.dumps(profile.model_dump(), ensure_ascii=False),
+                profile.model_dump_json(),
             )
             status = "identificado" if profile.identificado else "no identificado"
             print(f"[UserProfile] Guardado en caché ({status}) para {normalized[-4:]}")
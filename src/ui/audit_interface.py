@@ -13,9 +13,13 @@ Lanzar en modo standalone:
 
 from __future__ import annotations
 
+import os
+from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 import gradio as gr
+import pandas as pd
 
 from ..audit.audit_service import get_audit_service
 from ..audit.models import SessionSummary
@@ -28,29 +32,34 @@ from ..audit.replay import SessionReplayer
 # so the asyncpg pool (also created in that loop) is always reachable.
 # --------------------------------------------------------------------------
 
-async def _load_sessions(only_errors: bool, limit: int) -> list[list]:
-    """Carga sesiones y las formatea como filas de tabla."""
+async def _load_sessions(only_errors: bool, limit: int) -> pd.DataFrame:
+    """Carga sesiones y las formatea como tabla (DataFrame con _HEADERS)."""
     svc = await get_audit_service()
     has_error: Optional[bool] = True if only_errors else None
     sessions: list[SessionSummary] = await svc.list_sessions(
         limit=limit, has_error=has_error
     )
 
-    rows = []
-    for s in sessions:
-        prompt_v = ", ".join(f"{k}=v{v}" for k, v in s.prompt_versions.items())
-        rows.append([
-            s.session_id[:8] + "...",
-            s.session_id,
-            _fmt_ts_short(s.created_at),
-            s.model_id.split(".")[-1].split("-v")[0],
-            s.user_query or "-",
-            s.total_tokens,
-            f"{s.total_latency_ms}ms",
-            prompt_v or "-",
-            "[ERROR]" if s.has_error else "OK",
-        ])
-    return rows
+    # DataFrame ya armado con columnas: Gradio no vuelve a convertir
+    return pd.DataFrame.from_records(
+        (_session_row(s) for s in sessions), columns=_HEADERS
+    )
+
+
+def _session_row(s: SessionSummary) -> list:
+    """Una fila de la tabla de sesiones (mismo orden que _HEADERS)."""
+    sid = s.session_id
+    return [
+        sid[:8] + "...",
+        sid,
+        _fmt_ts_short(s.created_at),
+        _short_model(s.model_id),
+        s.user_query or "-",
+        s.total_tokens,
+        f"{s.total_latency_ms}ms",
+        _fmt_prompt_versions(tuple(s.prompt_versions.items())),
+        "[ERROR]" if s.has_error else "OK",
+    ]
 
 
 async def _replay_session(session_id_input: str) -> str:
@@ -91,6 +100,13 @@ _HEADERS = [
     "ID (corto)", "Session ID completo", "Fecha", "Modelo",
     "Query", "Tokens", "Latencia", "Prompts", "Estado"
 ]
+_DATATYPES = ["str"] * len(_HEADERS)
+
+# Varios auditores pueden cargar tablas/replays a la vez: cada query de
+# Insights hace su propio polling, así que no tiene sentido serializarlas
+# con el concurrency_limit=1 por defecto de Gradio.
+_UI_CONCURRENCY = int(os.getenv("AUDIT_UI_CONCURRENCY", "8"))
+_UI_QUEUE_MAX = int(os.getenv("AUDIT_UI_QUEUE_MAX", "64"))
 
 
 def create_audit_interface() -> gr.Blocks:
@@ -122,7 +138,7 @@ def create_audit_interface() -> gr.Blocks:
 
                 sessions_table = gr.Dataframe(
                     headers=_HEADERS,
-                    datatype=["str"] * len(_HEADERS),
+                    datatype=_DATATYPES,
                     interactive=False,
                     label="Sesiones registradas",
                     wrap=True,
@@ -139,6 +155,7 @@ def create_audit_interface() -> gr.Blocks:
 
                 refresh_btn.click(
                     fn=refresh,
+                    concurrency_limit=_UI_CONCURRENCY,
                     inputs=[only_errors_cb, limit_slider],
                     outputs=sessions_table,
                     api_name=False,
@@ -188,6 +205,7 @@ def create_audit_interface() -> gr.Blocks:
 
                 replay_btn.click(
                     fn=do_replay,
+                    concurrency_limit=_UI_CONCURRENCY,
                     inputs=session_id_input,
                     outputs=replay_output,
                     api_name=False,
@@ -212,6 +230,7 @@ def create_audit_interface() -> gr.Blocks:
                     api_name=False,
                 )
 
+    demo.queue(default_concurrency_limit=_UI_CONCURRENCY, max_size=_UI_QUEUE_MAX)
     return demo
 
 
@@ -219,9 +238,20 @@ def create_audit_interface() -> gr.Blocks:
 # Helpers de formato
 # --------------------------------------------------------------------------
 
+@lru_cache(maxsize=64)
+def _short_model(model_id: str) -> str:
+    """'us.anthropic.claude-3-haiku-v1:0' → 'claude-3-haiku' (pocos IDs distintos)."""
+    return model_id.split(".")[-1].split("-v")[0]
+
+
+@lru_cache(maxsize=64)
+def _fmt_prompt_versions(items: tuple) -> str:
+    """(("supervisor", "2"), ...) → 'supervisor=v2, ...' (se repite entre filas)."""
+    return ", ".join(f"{k}=v{v}" for k, v in items) or "-"
+
+
 def _fmt_ts_short(iso: str) -> str:
     try:
-        from datetime import datetime
         dt = datetime.fromisoformat(iso.replace("Z", "+00:00"))
         return dt.strftime("%Y-%m-%d %H:%M")
     except Exception:
@@ -20,8 +20,7 @@ from ..config import (
     BEDROCK_MODEL_ID,
     MOCK_USER_PROFILE,
 )
-from ..tools.push_notifications import send_push_notification
-from ..tools.cloudwatch_unhandled_queries import get_cw_service
+from ..tools.query_pipeline import report_unknown_query
 
 
 async def chat_function(
@@ -47,22 +46,6 @@ async def chat_function(
         audit_service = await get_audit_service()
 
     try:
-        async def on_unknown(q: str) -> None:
-            try:
-                cw = await get_cw_service()
-                await cw.save_unhandled_query(
-                    query=q,
-                    detected_intent="unknown",
-                    entities={},
-                    reason="unknown_intent",
-                )
-            except Exception as exc:
-                print(f"[CW] Error guardando query: {exc}")
-            try:
-                await send_push_notification(f"Query no identificada: {q}")
-            except Exception as exc:
-                print(f"[Push] Error: {exc}")
-
         from ..services.query_orchestrator import get_orchestrator
         result = await get_orchestrator().handle(
             query=message,
@@ -70,7 +53,7 @@ async def chat_function(
             session_id=session_id,
             audit_service=audit_service,
             log_prefix="[Chat]",
-            on_unknown_query=on_unknown,
+            on_unknown_query=report_unknown_query,
         )
         user_info = _build_user_info_text(result.user_profile, result.user_prefs)
         return result.response, result.session_id, user_info
@@ -7,6 +7,7 @@ Cubre:
   3. Cache de resultados — clave, hit/miss, paginación desde caché
 """
 
+import asyncio
 import os
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -644,14 +645,15 @@ class TestSearchResultsCache:
 
         entities = self._entities(categoria="gastronomia")
 
-        # Construir BenefitItems reales (Pydantic los valida)
-        def _item(idx: int) -> BenefitItem:
+        # Items con la forma de BenefitItem (Pydantic los valida),
+        # pasados como dicts crudos igual que en fetch_benefits
+        def _item(idx: int) -> dict:
             return BenefitItem(
                 i=idx, t=407, c=[], d=f"{10 + idx}",
                 q=None, a="1234567", b=f"Comercio {idx}",
                 ct="MODO", cti=[], m=None, r=[1], o=[],
                 f=230101, e=231231, pr=[151],
-            )
+            ).model_dump()
 
         mock_response = BenefitsResponse(
             success=True,
@@ -756,3 +758,282 @@ class TestSearchResultsCache:
             )
 
         assert fetch_call_count["n"] == 2
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 6. Items crudos de la API — chequeo de forma al indexar
+# ════════════════════════════════════════════════════════════════════════
+
+class TestIndexBenefits:
+    """_index_benefits reemplaza la validación por BenefitItem."""
+
+    def _raw(self, **overrides) -> dict:
+        item = {
+            "i": 1, "t": 407, "c": [], "d": "20", "q": None,
+            "a": "1234567", "b": "Carrefour", "ct": "MODO", "cti": [],
+            "m": None, "r": [1], "o": [], "f": 1, "e": 2, "pr": [151],
+        }
+        item.update(overrides)
+        return item
+
+    def test_malformed_items_dropped(self):
+        from src.tools.benefits_api import _index_benefits
+        from src.tools.normalizar import normalize_promo
+
+        bad_missing = self._raw()
+        del bad_missing["ct"]
+        data = [self._raw(), bad_missing, self._raw(b=None), "basura"]
+
+        indexed = _index_benefits(data)
+
+        assert len(indexed) == 1
+        assert indexed[0]["_bl"] == "carrefour"
+        # Lo que sobrevive se normaliza sin KeyError
+        assert normalize_promo(indexed[0])["nom"] == "Carrefour"
+
+    def test_non_list_payload_raises(self):
+        from src.tools.benefits_api import _index_benefits
+
+        with pytest.raises(ValueError):
+            _index_benefits({"error": "boom"})
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 7. CacheService — write-behind, auto-pipelining y fallback
+# ════════════════════════════════════════════════════════════════════════
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._ops: list = []
+
+    def setex(self, key, ttl, value):
+        self._ops.append((key, ttl, value))
+
+    async def execute(self):
+        # gate permite dejar el pipeline "en vuelo" desde el test
+        if self._redis.gate is not None:
+            await self._redis.gate.wait()
+        for op in self._ops:
+            await self._redis.setex(*op)
+        return [True] * len(self._ops)
+
+
+class _FakeRedis:
+    """Subconjunto de redis.asyncio.Redis que usa CacheService (en memoria)."""
+
+    def __init__(self):
+        self.store: dict = {}
+        self.ttls: dict = {}
+        self.gate = None
+        self.mget_calls = 0
+        self.fail_mget = False
+
+    async def mget(self, *keys):
+        self.mget_calls += 1
+        if self.fail_mget:
+            raise ConnectionError("redis caído")
+        return [self.store.get(k) for k in keys]
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+    async def unlink(self, *keys):
+        return sum(self.store.pop(k, None) is not None for k in keys)
+
+    async def exists(self, key):
+        return int(key in self.store)
+
+    async def ttl(self, key):
+        return self.ttls.get(key, -1) if key in self.store else -2
+
+    async def scan_iter(self, match, count=None):
+        from fnmatch import fnmatchcase
+        for key in list(self.store):
+            if fnmatchcase(key, match):
+                yield key
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+
+class _FakeRedisClient:
+    def __init__(self):
+        self.client = _FakeRedis()
+
+    async def is_connected(self):
+        return True
+
+    def mark_unhealthy(self):
+        pass
+
+
+class TestCacheService:
+    """Write-behind, MGET por tick, fallback al LRU y formatos de valor."""
+
+    def _service(self):
+        from src.cache.cache_service import CacheService
+
+        svc = CacheService()
+        svc._redis = _FakeRedisClient()
+        svc._initialized = True
+        return svc, svc._redis.client
+
+    @pytest.mark.asyncio
+    async def test_delete_during_flush_does_not_resurrect(self):
+        svc, fake = self._service()
+        fake.gate = asyncio.Event()
+
+        await svc.set("k", 1)
+        await asyncio.sleep(0)  # el flush sale y queda bloqueado en execute
+        assert "comafi:k" in svc._inflight_writes
+
+        delete_task = asyncio.create_task(svc.delete("k"))
+        await asyncio.sleep(0)
+        fake.gate.set()
+        assert await delete_task is True
+
+        assert await svc.get("k") is None
+        await svc.drain()
+        assert "comafi:k" not in fake.store
+
+    @pytest.mark.asyncio
+    async def test_reads_see_pending_set_before_flush(self):
+        svc, fake = self._service()
+
+        await svc.set("m", {"a": 1}, ttl=60)
+
+        # Nada llegó a Redis todavía, pero todas las lecturas lo ven
+        assert fake.store == {}
+        assert await svc.get("m") == {"a": 1}
+        assert await svc.mget(["m", "otra"]) == [{"a": 1}, None]
+        assert await svc.exists("m") is True
+        assert await svc.get_ttl("m") == 60
+
+        await svc.drain()
+        assert "comafi:m" in fake.store
+        assert fake.ttls["comafi:m"] == 60
+
+    @pytest.mark.asyncio
+    async def test_concurrent_gets_share_one_mget(self):
+        from src.cache.cache_service import _encode
+
+        svc, fake = self._service()
+        for k in ("a", "b", "c"):
+            fake.store[f"comafi:{k}"] = _encode(k.upper(), "msgpack")
+
+        values = await asyncio.gather(
+            svc.get("a"), svc.get("b"), svc.get("c"), svc.get("a")
+        )
+
+        assert values == ["A", "B", "C", "A"]
+        assert fake.mget_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_batched_get_error_falls_back_to_lru(self):
+        svc, fake = self._service()
+        await svc.set("k", [1, 2, 3])
+        await svc.drain()
+
+        fake.fail_mget = True
+
+        assert await svc.get("k") == [1, 2, 3]
+        assert await svc.get("nunca-visto") is None
+
+    @pytest.mark.asyncio
+    async def test_redis_miss_drops_local_entry(self):
+        svc, fake = self._service()
+        await svc.set("k", "v")
+        await svc.drain()
+
+        # Venció en Redis: el fallback no debe resucitarla
+        fake.store.clear()
+        assert await svc.get("k") is None
+
+        fake.fail_mget = True
+        assert await svc.get("k") is None
+        assert svc._local_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_local_entry_never_outlives_key_ttl(self):
+        import time
+
+        svc, _ = self._service()
+        await svc.set("corta", "v", ttl=5)
+        await svc.set("larga", "v", ttl=3600)
+        await svc.drain()
+
+        now = time.monotonic()
+        assert svc._local["corta"][0] <= now + 5
+        assert svc._local["larga"][0] <= now + svc._local_ttl
+
+    @pytest.mark.asyncio
+    async def test_local_lru_bounded_by_bytes(self):
+        svc, _ = self._service()
+        svc._local_max_bytes = 8 * 64
+
+        await svc.set("grande", "x" * 200)  # > 1/8 del presupuesto
+        for i in range(20):
+            await svc.set(f"k{i}", "y" * 40)
+        await svc.drain()
+
+        assert "grande" not in svc._local
+        assert svc._local_bytes <= svc._local_max_bytes
+        assert "k0" not in svc._local and "k19" in svc._local
+        assert svc._local_bytes == sum(e[2] for e in svc._local.values())
+
+    @pytest.mark.asyncio
+    async def test_decodes_tagged_and_legacy_json(self):
+        import orjson
+        from src.cache.cache_service import _encode
+
+        svc, fake = self._service()
+        value = {"nom": "Café", "ids": [1, 2]}
+        fake.store["comafi:mp"] = _encode(value, "msgpack")
+        fake.store["comafi:js"] = _encode(value, "json")
+        # Valor escrito antes de los prefijos de formato (JSON plano)
+        fake.store["comafi:legacy"] = orjson.dumps(value)
+
+        assert await svc.mget(["mp", "js", "legacy"]) == [value] * 3
+        assert await svc.get("legacy") == value
+
+    @pytest.mark.asyncio
+    async def test_queue_from_closed_loop_is_adopted(self):
+        from src.cache.cache_service import _decode, _encode
+
+        svc, fake = self._service()
+        # Cola que quedó de un asyncio.run que terminó antes del flush
+        dead_loop = asyncio.new_event_loop()
+        dead_loop.close()
+        svc._write_queue = {
+            "comafi:k": (_encode("viejo", "msgpack"), 60),
+            "comafi:otra": (_encode("otra", "msgpack"), 60),
+        }
+        svc._write_loop = dead_loop
+
+        await svc.set("k", "nuevo")
+        assert await svc.get("k") == "nuevo"
+        await svc.drain()
+
+        assert svc._write_queue == {}
+        assert _decode(fake.store["comafi:k"]) == "nuevo"
+        assert _decode(fake.store["comafi:otra"]) == "otra"
+
+    @pytest.mark.asyncio
+    async def test_direct_set_replaces_entry_queued_by_other_loop(self):
+        from src.cache.cache_service import _decode, _encode
+
+        svc, fake = self._service()
+        other_loop = asyncio.new_event_loop()
+        try:
+            svc._write_queue = {"comafi:k": (_encode("viejo", "msgpack"), 60)}
+            svc._write_loop = other_loop
+
+            await svc.set("k", "nuevo")
+
+            assert "comafi:k" not in svc._write_queue
+            assert _decode(fake.store["comafi:k"]) == "nuevo"
+            assert await svc.mget(["k"]) == ["nuevo"]
+        finally:
+            other_loop.close()